@@ -1,21 +1,38 @@
 # main.py
 import asyncio
-import json
 import argparse
-from dotenv import load_dotenv
+import orjson
+
+# Optional faster event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Internal imports
 from indexer_ze import ZeroEntropyArticleIndexer
-from search_ze import ZeroEntropyArticleSearcher
+from client_ze import configure_environment
+from search_ze import ZeroEntropyArticleSearcher, write_json_results
 from utils_ze import ZeroEntropyUtils
-from logger import getLogger
-
-# Load environment variables
-load_dotenv()
+from logger import enable_file_logging, getLogger
 
 # Configure logger to display log messages
 logger = getLogger()
 
+# RSS feed URLs to scrape, grouped by host so pooled connections are reused
+RSS_FEEDS = (
+    "https://vsd.fr/actu-people/feed/",
+    "https://vsd.fr/culture/feed/",
+    "https://vsd.fr/loisirs/feed/",
+    "https://vsd.fr/societe/feed/",
+    "https://vsd.fr/tele/feed/",
+    "https://www.public.fr/feed",
+    "https://www.public.fr/mode/feed",
+    "https://www.public.fr/people/familles-royales/feed",
+    "https://www.public.fr/people/feed",
+    "https://www.public.fr/tele/feed",
+)
+
 
 class ZeroEntropyArticleManager:
     """
@@ -30,41 +47,34 @@ class ZeroEntropyArticleManager:
 
     async def scrape_and_index(self):
         """Scrape RSS feeds and index articles"""
-        # Initialize RSS feed URLs
-        rss_public_urls = [
-            "https://www.public.fr/feed",
-            "https://www.public.fr/people/feed",
-            "https://www.public.fr/tele/feed",
-            "https://www.public.fr/mode/feed",
-            "https://www.public.fr/people/familles-royales/feed",
-        ]
-
-        rss_vsd_urls = [
-            "https://vsd.fr/actu-people/feed/",
-            "https://vsd.fr/tele/feed/",
-            "https://vsd.fr/societe/feed/",
-            "https://vsd.fr/culture/feed/",
-            "https://vsd.fr/loisirs/feed/",
-        ]
-
         # Initialize collection
         await self.indexer.initialize_collection()
 
-        # Extract content from RSS feeds
+        # Extract content from RSS feeds concurrently
+        try:
+            results = await asyncio.gather(
+                *(self.indexer.fetch_feed(url) for url in RSS_FEEDS),
+                return_exceptions=True,
+            )
+        finally:
+            self.indexer.save_feed_cache()
+            await self.indexer.close()
+
         articles = []
-        for url in rss_public_urls + rss_vsd_urls:
-            content = self.indexer.get_rss_feed_content(url)
-            if content:
+        for url, content in zip(RSS_FEEDS, results):
+            if isinstance(content, Exception):
+                logger.warning("Failed to extract content from %s: %s", url, content)
+            elif content:
                 articles.extend(content)
                 logger.info("Successfully extracted content from %s", url)
             else:
                 logger.warning("Failed to extract content from %s", url)
 
         # Save all content to a JSON file for backup
-        with open("articles.json", "w", encoding="utf-8") as f:
-            json.dump(articles, f, ensure_ascii=False, indent=4)
+        with open("articles.json", "wb") as f:
+            f.write(orjson.dumps(articles, option=orjson.OPT_INDENT_2))
 
-        logger.info(f"Extracted {len(articles)} articles total")
+        logger.info("Extracted %d articles total", len(articles))
 
         # Index articles in ZeroEntropy
         if articles:
@@ -82,6 +92,7 @@ class ZeroEntropyArticleManager:
         filter_category: str = None,
         reranker: str = "zerank-1-small",
         show_status: bool = False,
+        json_output: bool = False,
     ):
         """Search for articles"""
         # Show status if requested
@@ -105,7 +116,6 @@ class ZeroEntropyArticleManager:
                 filter_dict=filter_dict,
                 reranker=reranker,
             )
-            self.searcher.display_document_results(results, query)
 
         elif search_type == "snippets":
             results = await self.searcher.search_snippets(
@@ -114,18 +124,27 @@ class ZeroEntropyArticleManager:
                 filter_dict=filter_dict,
                 reranker=reranker,
             )
-            self.searcher.display_snippet_results(results, query)
 
         elif search_type == "pages":
             results = await self.searcher.search_pages(
                 query=query, k=k, filter_dict=filter_dict
             )
-            self.searcher.display_page_results(results, query)
 
         elif search_type == "advanced":
             results = await self.utils.search_and_rerank(
                 query=query, k=k * 2, rerank_top_n=k
             )
+
+        # Display results based on type
+        if json_output:
+            write_json_results(results)
+        elif search_type == "documents":
+            self.searcher.display_document_results(results, query)
+        elif search_type == "snippets":
+            self.searcher.display_snippet_results(results, query)
+        elif search_type == "pages":
+            self.searcher.display_page_results(results, query)
+        elif search_type == "advanced":
             self.utils.display_advanced_results(results, query)
 
         return results
@@ -134,15 +153,15 @@ class ZeroEntropyArticleManager:
         """Manage collections (list, delete, status)"""
         if action == "list":
             collections = await self.utils.list_all_collections()
-            logger.info(f"Available collections: {collections}")
+            logger.info("Available collections: %s", collections)
             return collections
 
         elif action == "delete" and collection_name:
             success = await self.utils.delete_collection(collection_name)
             if success:
-                logger.info(f"Successfully deleted collection: {collection_name}")
+                logger.info("Successfully deleted collection: %s", collection_name)
             else:
-                logger.info(f"Failed to delete collection: {collection_name}")
+                logger.info("Failed to delete collection: %s", collection_name)
             return success
 
         elif action == "status":
@@ -178,6 +197,8 @@ async def main():
                                help="Show collection status before searching")
     search_parser.add_argument("--reranker", type=str, default="zerank-1-small",
                                help="Reranker model to use")
+    search_parser.add_argument("--json", action="store_true",
+                               help="Print results as JSON instead of the formatted report")
 
     # Collection management command
     manage_parser = subparsers.add_parser("manage", help="Manage collections")
@@ -185,9 +206,13 @@ async def main():
                                help="Management action to perform")
     manage_parser.add_argument("--collection", type=str, help="Collection name (required for delete)")
 
-    # Parse arguments
+    # Parse arguments, so --help and usage errors exit before touching .env or the log directory
     args = parser.parse_args()
 
+    # Load environment variables, then attach the log file handler unless LOG_TO_FILE=0
+    configure_environment()
+    enable_file_logging()
+
     if args.command == "scrape":
         # Initialize manager and scrape
         manager = ZeroEntropyArticleManager(args.collection)
@@ -203,7 +228,8 @@ async def main():
             filter_creator=args.filter_creator,
             filter_category=args.filter_category,
             reranker=args.reranker,
-            show_status=args.status
+            show_status=args.status,
+            json_output=args.json,
         )
 
     elif args.command == "manage":
@@ -216,5 +242,8 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Run the main async function
-    asyncio.run(main())
+    # Run the main async function, on uvloop when it is installed
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -0,0 +1,176 @@
+# cache_ze.py
+import threading
+import time
+from typing import Optional, Tuple
+
+# Optional dependencies: the semantic cache is disabled when they are not installed
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    faiss = None
+    np = None
+    SentenceTransformer = None
+
+# Logger import
+from logger import getLogger
+
+# Configure logger to display log messages
+logger = getLogger()
+
+
+class SemanticQueryCache:
+    """
+    SemanticQueryCache returns previous search results for queries that are semantically close to a past query.
+
+    Queries are embedded with a sentence-transformers model and looked up in a FAISS inner-product index.
+    A cached entry is returned when the cosine similarity reaches the threshold and the search parameters
+    (search type, k, reranker, filters) are identical and the entry is younger than the TTL.
+    When the cache is full the oldest entries are evicted, and the FAISS index is rebuilt from the rest.
+
+    Entries live in memory and the embedding model takes seconds to load, so the cache only pays off in
+    long-lived processes such as the Streamlit app, where it is shared across sessions and thread-safe.
+    Call `load` ahead of the first query to keep the model load off the search path.
+
+    Parameters
+    ----------
+    model_name : str, optional
+        Name of the sentence-transformers model used to embed queries,
+        by default "paraphrase-multilingual-MiniLM-L12-v2"
+    threshold : float, optional
+        Minimum cosine similarity for a cache hit, by default 0.95
+    maxsize : int, optional
+        Maximum number of cached queries, by default 500
+    ttl : float, optional
+        Lifetime of a cached entry in seconds, by default 300.0
+
+    Attributes
+    ----------
+    enabled : bool
+        Whether faiss and sentence-transformers are installed
+    entries : list
+        List of (timestamp, key, results, embedding) tuples, oldest first, aligned with the FAISS index ids
+    """
+
+    def __init__(
+        self,
+        model_name: str = "paraphrase-multilingual-MiniLM-L12-v2",
+        threshold: float = 0.95,
+        maxsize: int = 500,
+        ttl: float = 300.0,
+    ):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.enabled = faiss is not None and SentenceTransformer is not None
+        self.embedder = None
+        self.index = None
+        self.entries = []
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+        if not self.enabled:
+            logger.debug("faiss or sentence-transformers not installed, semantic cache disabled")
+
+    def load(self):
+        """Load the embedding model and create the FAISS index, once, typically from a warmup thread."""
+        if not self.enabled or self.embedder is not None:
+            return
+
+        # A separate lock, so loading the model never blocks lookups of the entries
+        with self._load_lock:
+            if self.embedder is None:
+                embedder = SentenceTransformer(self.model_name)
+                self.index = faiss.IndexFlatIP(embedder.get_sentence_embedding_dimension())
+                self.embedder = embedder
+
+    def _encode(self, query: str):
+        """Embed a query into a normalized float32 vector of shape (1, dim), loading the model if needed."""
+        self.load()
+        return self.embedder.encode([query], normalize_embeddings=True).astype("float32")
+
+    def _evict(self, now: float, room: int = 0):
+        """Drop the expired entries and the oldest ones beyond maxsize - room, rebuilding the index if any."""
+        kept = [entry for entry in self.entries if now - entry[0] < self.ttl]
+        kept = kept[max(0, len(kept) - (self.maxsize - room)):]
+        if len(kept) == len(self.entries):
+            return
+
+        self.entries = kept
+        self.index.reset()
+        if kept:
+            self.index.add(np.vstack([entry[3] for entry in kept]))
+
+    def get(self, query: str, key: tuple) -> Tuple[Optional[list], Optional["np.ndarray"]]:
+        """
+        Look up the results of a semantically similar query with the same search parameters.
+
+        Parameters
+        ----------
+        query : str
+            The search query string
+        key : tuple
+            Hashable tuple of the search parameters
+
+        Returns
+        -------
+        Tuple[Optional[list], Optional[np.ndarray]]
+            The cached results, or None on a cache miss, and the query embedding, to pass to `add`
+            after a miss so the query is embedded only once. The embedding is None when the cache is
+            disabled.
+        """
+        if not self.enabled:
+            return None, None
+
+        # Embed outside the lock, so a slow encoding does not block the other sessions
+        q_emb = self._encode(query)
+
+        with self._lock:
+            self._evict(time.monotonic())
+            if not self.entries:
+                return None, q_emb
+
+            scores, ids = self.index.search(q_emb, min(10, len(self.entries)))
+            for score, idx in zip(scores[0], ids[0]):
+                if score < self.threshold:
+                    break
+                _, entry_key, results, _ = self.entries[idx]
+                if entry_key == key:
+                    logger.info("Semantic cache hit for query '%s' (similarity %.3f)", query, score)
+                    return results, q_emb
+        return None, q_emb
+
+    def add(self, query: str, key: tuple, results: list, embedding: Optional["np.ndarray"] = None):
+        """
+        Store the results of a query in the cache.
+
+        Parameters
+        ----------
+        query : str
+            The search query string
+        key : tuple
+            Hashable tuple of the search parameters
+        results : list
+            The search results to cache
+        embedding : np.ndarray, optional
+            Embedding of the query returned by `get`, computed from the query when None, by default None
+        """
+        if not self.enabled:
+            return
+
+        q_emb = embedding if embedding is not None else self._encode(query)
+
+        with self._lock:
+            now = time.monotonic()
+            self._evict(now, room=1)
+            self.index.add(q_emb)
+            self.entries.append((now, key, results, q_emb))
+
+    def clear(self):
+        """Drop every cached entry, keeping the loaded embedding model."""
+        with self._lock:
+            self.entries = []
+            if self.index is not None:
+                self.index.reset()
@@ -0,0 +1,84 @@
+# client_ze.py
+import functools
+import pathlib
+from typing import Optional
+import httpx
+from dotenv import load_dotenv
+from zeroentropy import AsyncZeroEntropy, DefaultAsyncHttpxClient
+
+# Optional HTTP/2 support for httpx (pip install "httpx[http2]")
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+
+@functools.lru_cache(maxsize=1)
+def configure_environment() -> bool:
+    """
+    Load the environment variables from the .env file, once per process.
+
+    Called by the classes of this package before creating the ZeroEntropy client,
+    so importing a module no longer reads the .env file.
+
+    Returns
+    -------
+    bool
+        Always True, the result is cached so later calls are free
+    """
+    load_dotenv()
+    return True
+
+
+# Process-wide ZeroEntropy client, shared so the searcher, utils and indexer reuse one connection pool
+_ZCLIENT: Optional[AsyncZeroEntropy] = None
+
+
+def get_client() -> AsyncZeroEntropy:
+    """
+    Return the shared ZeroEntropy async client, creating it on first use.
+
+    When the h2 package is installed, the client speaks HTTP/2 so concurrent queries are multiplexed
+    over a single pooled connection instead of opening one TLS connection each.
+
+    Returns
+    -------
+    AsyncZeroEntropy
+        The process-wide ZeroEntropy async client instance
+    """
+    global _ZCLIENT
+    if _ZCLIENT is None:
+        configure_environment()
+        http_client = None
+        if h2 is not None:
+            http_client = DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+            )
+        _ZCLIENT = AsyncZeroEntropy(http_client=http_client)
+    return _ZCLIENT
+
+
+async def close_client() -> None:
+    """Close the shared ZeroEntropy client and its connection pool, if it was created."""
+    global _ZCLIENT
+    if _ZCLIENT is not None:
+        await _ZCLIENT.close()
+        _ZCLIENT = None
+
+
+def collection_sentinel(collection_name: str) -> pathlib.Path:
+    """
+    Return the local sentinel file recording that a collection was created, see `initialize_collection`.
+
+    Parameters
+    ----------
+    collection_name : str
+        Name of the collection
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the `.ze_init_<collection_name>` file in the working directory
+    """
+    return pathlib.Path(f".ze_init_{collection_name}")
@@ -1,48 +1,316 @@
 # indexer_ze.py
-import requests
+import asyncio
+import aiohttp
+import functools
+import hashlib
+import html
+import io
+import os
+import re
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
-from zeroentropy import AsyncZeroEntropy, ConflictError
+from lxml import etree, html as lxml_html
+from zeroentropy import ConflictError, NotFoundError
 
-# Logger import
+# Internal imports
+from client_ze import collection_sentinel, configure_environment, get_client
 from logger import getLogger
 
-# Load environment variables
-load_dotenv()
-
 # Configure logger to display log messages
 logger = getLogger()
 
+# HTTP headers sent with every RSS feed request
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"  # noqa: E501
+}
+
+# Maximum number of categories kept per article
+MAX_CATEGORIES = 5
+
+# Sidecar file caching parsed feeds alongside their ETag/Last-Modified validators
+RSS_CACHE_PATH = ".rss_cache.json"
+
+# Maximum number of documents added to ZeroEntropy concurrently
+INDEX_CONCURRENCY = 16
+
+# Namespaces used by the RSS item fields
+NS = {
+    "dc": "http://purl.org/dc/elements/1.1/",
+    "content": "http://purl.org/rss/1.0/modules/content/",
+}
+
+# Pre-compiled XPath selectors, evaluated once per RSS item
+XP_TITLE = etree.XPath("title/text()")
+XP_CREATOR = etree.XPath("dc:creator/text()", namespaces=NS)
+XP_CATEGORIES = etree.XPath("category/text()")
+XP_DESCRIPTION = etree.XPath("description/text()")
+XP_PUB_DATE = etree.XPath("pubDate/text()")
+XP_CONTENT_ENCODED = etree.XPath("content:encoded/text()", namespaces=NS)
+XP_GUID = etree.XPath("guid/text()")
+XP_LINK = etree.XPath("link/text()")
+
+
+# Pre-compiled patterns used to strip simple HTML fragments without parsing them
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)\b", re.I)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Maximum length of each metadata field stored in ZeroEntropy
+META_LIMITS = {
+    "title": 500,
+    "creator": 200,
+    "categories": 300,
+    "pub_date": 100,
+    "source_url": 300,
+}
+
+
+def _truncate_meta(article: Dict) -> Dict:
+    """
+    Build the ZeroEntropy metadata of an article, truncating each field to its META_LIMITS length.
+
+    Parameters
+    ----------
+    article : Dict
+        Article dictionary as returned by `_parse_rss_bytes`
+
+    Returns
+    -------
+    Dict
+        Metadata dictionary with keys title, creator, categories, pub_date, source_url and type
+    """
+    fields = {**article, "categories": ", ".join(article["categories"][:MAX_CATEGORIES])}
+    metadata = {key: fields[key][:limit] for key, limit in META_LIMITS.items()}
+    metadata["type"] = "rss_article"
+    return metadata
+
+
+def _clean_html(raw: str) -> str:
+    """
+    Convert an HTML fragment to plain text, dropping script and style elements.
+
+    Fragments without script or style elements, such as most descriptions, are stripped with
+    pre-compiled regexes and skip the HTML parser entirely.
+
+    Parameters
+    ----------
+    raw : str
+        The HTML fragment to clean
+
+    Returns
+    -------
+    str
+        The text content of the fragment, with whitespace collapsed to single spaces
+    """
+    if not raw or raw == "N/A":
+        return ""
+
+    if not _SCRIPT_STYLE_RE.search(raw):
+        return " ".join(html.unescape(_TAG_RE.sub(" ", raw)).split())
+
+    tree = lxml_html.fromstring(raw)
+    etree.strip_elements(tree, "script", "style", with_tail=False)
+    return " ".join(text.strip() for text in tree.itertext() if text.strip()).replace("\n", " ")
+
+
+def _parse_rss_bytes(body: bytes, url: str) -> List[Dict]:
+    """
+    Extract content from a raw RSS feed and returns a list of dictionaries containing the extracted content.
+
+    This is a pure CPU-bound function defined at module level so it can run in a worker thread or process.
+
+    Parameters
+    ----------
+    body : bytes
+        The raw RSS feed response body
+    url : str
+        The RSS feed URL the body was fetched from
+
+    Returns
+    -------
+    List[Dict]
+        A list of dictionaries, each containing article information with keys:
+        - title : str
+            The article title
+        - creator : str
+            The article author/creator
+        - categories : List[str]
+            List of article categories, limited to the first MAX_CATEGORIES
+        - description : str
+            Brief description of the article
+        - pub_date : str
+            Publication date of the article
+        - content : str
+            Full cleaned text content of the article
+        - link : str
+            The article guid, or its link when the feed has no guid
+        - source_url : str
+            The original RSS feed URL
+    """
+    # Stream-parse the feed one <item> at a time instead of building the whole tree, recovering from
+    # malformed markup (e.g. undefined HTML entities) instead of dropping the whole feed
+    context = etree.iterparse(io.BytesIO(body), events=("end",), tag="item", recover=True, huge_tree=False)
+    content_list = []
+
+    try:
+        for _, item in context:
+            try:
+                content_list.append(_parse_item(item, url))
+            except Exception as e:
+                logger.warning("Skipping malformed item in %s: %s", url, e)
+
+            # Free the processed item and its already-parsed siblings
+            item.clear()
+            while item.getprevious() is not None:
+                del item.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        logger.warning("Unrecoverable XML error in %s, keeping %d items: %s", url, len(content_list), e)
+
+    return content_list
+
+
+def _parse_item(item, url: str) -> Dict:
+    """Extract the article dictionary of a single RSS <item> element, see `_parse_rss_bytes`."""
+    t = XP_TITLE(item)
+    title = t[0].strip() if t else "N/A"
+    c = XP_CREATOR(item)
+    creator = c[0].strip() if c else "N/A"
+    # Only the first categories are indexed, so skip the rest
+    categories = [category.strip() for category in XP_CATEGORIES(item)[:MAX_CATEGORIES]]
+    d = XP_DESCRIPTION(item)
+    description = d[0].strip() if d else "N/A"
+    p = XP_PUB_DATE(item)
+    publication_date = p[0].strip() if p else "N/A"
+    ce = XP_CONTENT_ENCODED(item)
+    content_encoded = ce[0].strip() if ce else "N/A"
+    lk = XP_GUID(item) or XP_LINK(item)
+    link = lk[0].strip() if lk else ""
+
+    # Clean up HTML content, falling back to the description when there is no full content
+    content_text = _clean_html(content_encoded if content_encoded != "N/A" else description)
+
+    return {
+        "title": title,
+        "creator": creator,
+        "categories": categories,
+        "description": description,
+        "pub_date": publication_date,
+        "content": content_text,
+        "link": link,
+        "source_url": url
+    }
+
 
 class ZeroEntropyArticleIndexer:
     """
     ZeroEntropyArticleIndexer handles RSS feed scraping and article indexing using ZeroEntropy API.
     """
-    def __init__(self, collection_name: str = "articles"):
+    def __init__(
+        self,
+        collection_name: str = "articles",
+        cache_path: str = RSS_CACHE_PATH,
+        parse_workers: int = 0,
+    ):
+        # Load environment variables
+        configure_environment()
+
         self.collection_name = collection_name
-        self.zclient = AsyncZeroEntropy()
+        self.zclient = get_client()
+        self.http = None
+        self.cache_path = cache_path
+        self.feed_cache = None
+        self.parse_workers = parse_workers
+        self.parse_pool = None
+        self._initialized = False
+
+    def _get_http(self) -> aiohttp.ClientSession:
+        """
+        Return the persistent HTTP session used to fetch RSS feeds, creating it on first use.
+
+        The session must be created inside a running event loop, hence the lazy initialization.
+        Its connector keeps connections alive so feeds hosted on the same site reuse sockets.
+        """
+        if self.http is None or self.http.closed:
+            self.http = aiohttp.ClientSession(
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=15),
+                connector=aiohttp.TCPConnector(limit=20, limit_per_host=10),
+            )
+        return self.http
+
+    def _get_feed_cache(self) -> Dict:
+        """
+        Return the on-disk feed cache mapping each URL to its validators and parsed items, loading it on first use.
+        """
+        if self.feed_cache is None:
+            self.feed_cache = {}
+            if os.path.isfile(self.cache_path):
+                try:
+                    with open(self.cache_path, "rb") as f:
+                        self.feed_cache = orjson.loads(f.read())
+                except (OSError, orjson.JSONDecodeError):
+                    logger.warning("Could not read RSS cache %s, starting from scratch", self.cache_path)
+        return self.feed_cache
+
+    def save_feed_cache(self):
+        """Persist the feed cache to disk so the next run can send conditional requests."""
+        if self.feed_cache is not None:
+            with open(self.cache_path, "wb") as f:
+                f.write(orjson.dumps(self.feed_cache))
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """Return the process pool used to parse feeds in parallel, creating it on first use."""
+        if self.parse_pool is None:
+            self.parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+        return self.parse_pool
+
+    async def close(self):
+        """Close the persistent HTTP session and the parsing process pool, if they were opened."""
+        if self.http is not None and not self.http.closed:
+            await self.http.close()
+        self.http = None
+
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+        self.parse_pool = None
 
     async def initialize_collection(self):
         """
         Initialize ZeroEntropy collection. Creates a new collection in ZeroEntropy if it doesn't exist.
         If the collection already exists, logs a message and continues.
 
+        Once the collection is known to exist, a local sentinel file `.ze_init_<collection_name>` is
+        created so later runs skip the API round trip. `delete_collection` removes the file, and
+        `index_articles` re-creates the collection when it was deleted server-side anyway.
+
         Raises
         ------
         ConflictError
             If there's a conflict during collection creation (handled gracefully)
         """
+        init_file = collection_sentinel(self.collection_name)
+        if self._initialized or init_file.exists():
+            self._initialized = True
+            return
+
         try:
             await self.zclient.collections.add(collection_name=self.collection_name)
-            logger.info(f"Created new collection: {self.collection_name}")
+            logger.info("Created new collection: %s", self.collection_name)
         except ConflictError:
-            logger.error(f"Collection '{self.collection_name}' already exists")
+            logger.error("Collection '%s' already exists", self.collection_name)
+
+        init_file.touch()
+        self._initialized = True
 
-    @staticmethod
-    def get_rss_feed_content(url: str) -> List[Dict]:
+    async def fetch_feed(self, url: str) -> List[Dict]:
         """
-        Extract content from an RSS feed URL and returns a list of dictionaries containing the extracted content.
+        Fetch an RSS feed asynchronously and extract its content.
+
+        The HTTP request runs on the event loop so several feeds can be fetched concurrently,
+        while the CPU-bound parsing is offloaded to a worker thread, or to a process pool when
+        `parse_workers` is set. All feeds share the indexer's
+        keep-alive session. Requests are made conditional on the cached ETag/Last-Modified values,
+        and a 304 Not Modified response returns the cached items without downloading or parsing the feed.
 
         Parameters
         ----------
@@ -52,75 +320,43 @@ class ZeroEntropyArticleIndexer:
         Returns
         -------
         List[Dict]
-            A list of dictionaries, each containing article information with keys:
-            - title : str
-                The article title
-            - creator : str
-                The article author/creator
-            - categories : List[str]
-                List of article categories
-            - description : str
-                Brief description of the article
-            - pub_date : str
-                Publication date of the article
-            - content : str
-                Full cleaned text content of the article
-            - source_url : str
-                The original RSS feed URL
+            A list of article dictionaries, see `_parse_rss_bytes` for the keys
 
         Raises
         ------
-        requests.exceptions.HTTPError
+        aiohttp.ClientResponseError
             If the HTTP request fails
-        requests.exceptions.RequestException
+        aiohttp.ClientError
             If there's a general request error
         """
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"  # noqa: E501
-        }
+        cached = self._get_feed_cache().get(url)
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
 
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        response.encoding = "utf-8"
-
-        soup = BeautifulSoup(response.content, "xml")
-        items = soup.find_all("item")
-        content_list = []
-
-        for item in items:
-            title = item.find("title").get_text(strip=True) if item.find("title") else "N/A"
-            creator = item.find("dc:creator").get_text(strip=True) if item.find("dc:creator") else "N/A"
-            categories = [category.get_text(strip=True) for category in item.find_all("category")]
-            description = item.find("description").get_text(strip=True) if item.find("description") else "N/A"
-            publication_date = item.find("pubDate").get_text(strip=True) if item.find("pubDate") else "N/A"
-            content_encoded = (
-                item.find("content:encoded").get_text(strip=True) if item.find("content:encoded") else "N/A"
-            )
+        async with self._get_http().get(url, headers=headers) as response:
+            if response.status == 304 and cached:
+                logger.info("Feed %s not modified, using cached content", url)
+                return cached["parsed_items"]
+            response.raise_for_status()
+            body = await response.read()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
 
-            # Clean up HTML content
-            content_text = ""
-            if content_encoded != "N/A":
-                content_encoded_soup = BeautifulSoup(content_encoded, "html.parser")
-                for script_or_style in content_encoded_soup(["script", "style"]):
-                    script_or_style.decompose()
-                content_text = content_encoded_soup.get_text(separator=" ", strip=True).replace("\n", " ")
-            else:
-                description_soup = BeautifulSoup(description, "html.parser")
-                for script_or_style in description_soup(["script", "style"]):
-                    script_or_style.decompose()
-                content_text = description_soup.get_text(separator=" ", strip=True).replace("\n", " ")
-
-            content_list.append({
-                "title": title,
-                "creator": creator,
-                "categories": categories,
-                "description": description,
-                "pub_date": publication_date,
-                "content": content_text,
-                "source_url": url
-            })
-
-        return content_list
+        if self.parse_workers:
+            loop = asyncio.get_running_loop()
+            parsed_items = await loop.run_in_executor(self._get_parse_pool(), _parse_rss_bytes, body, url)
+        else:
+            parsed_items = await asyncio.to_thread(_parse_rss_bytes, body, url)
+        self.feed_cache[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "parsed_items": parsed_items,
+        }
+        return parsed_items
 
     async def index_articles(self, articles: List[Dict]):
         """
@@ -128,6 +364,8 @@ class ZeroEntropyArticleIndexer:
 
         Takes a list of article dictionaries and indexes them in the ZeroEntropy
         collection. Creates unique document paths and prepares metadata for each article.
+        When the collection no longer exists despite the sentinel file, it is re-created once and
+        the failed documents are retried.
 
         Parameters
         ----------
@@ -138,41 +376,74 @@ class ZeroEntropyArticleIndexer:
         """
         indexed_count = 0
         failed_count = 0
+        recreated = False
+        recreate_lock = asyncio.Lock()
 
-        for idx, article in enumerate(articles):
-            try:
-                # Create unique document path
-                doc_path = f"article_{idx}_{hash(article['title'][:50])}"
-
-                # Prepare content for indexing - combine title, description, and content
-                full_content = f"Title: {article['title']}\n\n"
-                full_content += f"Description: {article['description']}\n\n"
-                full_content += f"Content: {article['content']}"
-
-                # Prepare metadata
-                metadata = {
-                    "title": article["title"][:500],  # Limit length for metadata
-                    "creator": article["creator"][:200],
-                    "categories": ", ".join(article["categories"][:5])[:300],  # Limit categories
-                    "pub_date": article["pub_date"][:100],
-                    "source_url": article["source_url"][:300],
-                    "type": "rss_article",
-                }
-
-                # Add document to ZeroEntropy
-                await self.zclient.documents.add(
-                    collection_name=self.collection_name,
-                    path=doc_path,
-                    content={"type": "text", "text": full_content},
-                    metadata=metadata,
-                )
-
-                indexed_count += 1
-                if indexed_count % 10 == 0:
-                    logger.info(f"Indexed {indexed_count} articles...")
-
-            except ConflictError:
-                logger.warning(f"Article {idx} already exists, skipping...")
-                continue
-
-        logger.info(f"Indexing complete. Success: {indexed_count}, Failed: {failed_count}")
+        async def _recreate_collection():
+            nonlocal recreated
+
+            async with recreate_lock:
+                if not recreated:
+                    logger.warning("Collection '%s' not found, re-creating it", self.collection_name)
+                    collection_sentinel(self.collection_name).unlink(missing_ok=True)
+                    self._initialized = False
+                    await self.initialize_collection()
+                    recreated = True
+
+        async def _add_one(sem: asyncio.Semaphore, idx: int, article: Dict) -> bool:
+            nonlocal indexed_count
+
+            async with sem:
+                try:
+                    # Create a unique document path from the full title and the article guid/link, stable
+                    # across runs so re-indexing hits ConflictError
+                    key = f"{article['title']}\n{article.get('link', '')}"
+                    doc_hash = hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+                    doc_path = f"article_{doc_hash}"
+
+                    # Prepare content for indexing - combine title, description, and content
+                    full_content = (
+                        f"Title: {article['title']}\n\n"
+                        f"Description: {article['description']}\n\n"
+                        f"Content: {article['content']}"
+                    )
+
+                    # Prepare metadata
+                    metadata = _truncate_meta(article)
+
+                    # Add document to ZeroEntropy, re-creating a collection deleted behind the sentinel file
+                    add_document = functools.partial(
+                        self.zclient.documents.add,
+                        collection_name=self.collection_name,
+                        path=doc_path,
+                        content={"type": "text", "text": full_content},
+                        metadata=metadata,
+                    )
+                    try:
+                        await add_document()
+                    except NotFoundError:
+                        await _recreate_collection()
+                        await add_document()
+
+                    indexed_count += 1
+                    if indexed_count % 10 == 0:
+                        logger.info("Indexed %d articles...", indexed_count)
+                    return True
+
+                except ConflictError:
+                    logger.warning("Article %d already exists, skipping...", idx)
+                    return False
+
+        # Add documents concurrently, bounded to avoid overwhelming the API
+        sem = asyncio.Semaphore(INDEX_CONCURRENCY)
+        results = await asyncio.gather(
+            *[_add_one(sem, idx, article) for idx, article in enumerate(articles)],
+            return_exceptions=True,
+        )
+
+        for idx, result in enumerate(results):
+            if isinstance(result, Exception):
+                failed_count += 1
+                logger.error("Failed to index article %d: %s", idx, result)
+
+        logger.info("Indexing complete. Success: %d, Failed: %d", indexed_count, failed_count)
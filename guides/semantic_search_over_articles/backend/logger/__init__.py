@@ -1 +1 @@
-from .logging import CustomLogRecord, getLogger  # noqa: F401
+from .logging import CustomLogRecord, enable_file_logging, getLogger  # noqa: F401
@@ -1,8 +1,44 @@
 from coloredlogs import ColoredFormatter
+import functools
 import logging
+import logging.handlers
 import socket
 import os
 
+# Thread, process and multiprocessing details are never logged, skip collecting them for each record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Hostname of the machine, stable for the lifetime of the process
+_HOSTNAME = socket.gethostname()
+
+# Styles of the colored console output, shared by every logger
+_LEVEL_STYLES = {
+    "critical": {"bold": True, "color": "red"},
+    "debug": {"color": "green"},
+    "error": {"color": "red"},
+    "info": {"color": "white"},
+    "notice": {"color": "magenta"},
+    "spam": {"color": "green", "faint": True},
+    "success": {"bold": True, "color": "green"},
+    "verbose": {"color": "blue"},
+    "warning": {"color": "yellow"},
+}
+
+_FIELD_STYLES = {
+    "asctime": {"color": "green"},
+    "hostname": {"color": "magenta"},
+    "levelname": {"bold": True, "color": "magenta"},
+    "module": {"color": "blue"},
+    "programname": {"color": "cyan"},
+    "username": {"color": "yellow"},
+}
+
+# Format of every log record, on the console and in the log file
+_LOG_FORMAT = "%(asctime)s | %(module)s | %(levelname)-8s | %(message)s [%(filename)s:%(lineno)s]"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 class CustomLogRecord(logging.LogRecord):
     """
@@ -29,29 +65,36 @@ class CustomLogRecord(logging.LogRecord):
 
         Notes
         -----
-        This function initializes the object with the hostname of the system using the socket module.
+        This function initializes the object with the hostname of the system, resolved once at import
+        using the socket module.
 
         Raises
         ------
         None
         """
         super().__init__(*args, **kwargs)
-        self.hostname = socket.gethostname()
+        self.hostname = _HOSTNAME
 
 
-def getLogger(name: str = "main", loglevel: str = "INFO", logdir: str = "./logs", stream=None, color_logs=True):
+@functools.lru_cache(maxsize=8)
+def getLogger(name: str = "main", loglevel: str = "INFO", stream=None, color_logs=True):
     """
     Get a logger object with custom settings and formatters.
 
     Parameters:
         name (str): Name of the logger.
         loglevel (str): Log level for the logger.
-        logdir (str): Directory to store log files.
         stream (stream): Stream to write logs to.
         color_logs (bool): Whether to colorize logs.
 
+    Only the console handler is attached, so importing a module that creates its logger neither
+    reads `.env` nor creates the log directory; the log file is added by `enable_file_logging`.
+
     Returns:
         logger: A logger object with custom settings and formatters.
+
+    Notes:
+        Calls are memoized on their arguments, so repeated calls return the configured logger directly.
     """
     logging.setLogRecordFactory(CustomLogRecord)
     logger = logging.getLogger(name)
@@ -63,41 +106,15 @@ def getLogger(name: str = "main", loglevel: str = "INFO", logdir: str = "./logs"
         loglevel = getattr(logging, loglevel.upper(), logging.INFO)
         logger.setLevel(loglevel)
 
-        log_format = "%(asctime)s | %(module)s | %(levelname)-8s | %(message)s [%(filename)s:%(lineno)s]"
-
-        simple_formatter = logging.Formatter(log_format, datefmt="%Y-%m-%d %H:%M:%S")
+        simple_formatter = logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT)
 
         colored_formatter = ColoredFormatter(
-            log_format,
-            datefmt="%Y-%m-%d %H:%M:%S",
-            level_styles={
-                "critical": {"bold": True, "color": "red"},
-                "debug": {"color": "green"},
-                "error": {"color": "red"},
-                "info": {"color": "white"},
-                "notice": {"color": "magenta"},
-                "spam": {"color": "green", "faint": True},
-                "success": {"bold": True, "color": "green"},
-                "verbose": {"color": "blue"},
-                "warning": {"color": "yellow"},
-            },
-            field_styles={
-                "asctime": {"color": "green"},
-                "hostname": {"color": "magenta"},
-                "levelname": {"bold": True, "color": "magenta"},
-                "module": {"color": "blue"},
-                "programname": {"color": "cyan"},
-                "username": {"color": "yellow"},
-            },
+            _LOG_FORMAT,
+            datefmt=_DATE_FORMAT,
+            level_styles=_LEVEL_STYLES,
+            field_styles=_FIELD_STYLES,
         )
 
-        if not os.path.isdir(logdir):
-            os.mkdir(logdir)
-
-        fileHandler = logging.FileHandler(os.path.join(logdir, "logs.txt"))
-        fileHandler.setLevel(logging.DEBUG)
-        fileHandler.setFormatter(simple_formatter)
-
         streamHandler = logging.StreamHandler(stream=stream)
         streamHandler.setLevel(loglevel)
         if color_logs:
@@ -105,15 +122,51 @@ def getLogger(name: str = "main", loglevel: str = "INFO", logdir: str = "./logs"
         else:
             streamHandler.setFormatter(simple_formatter)
 
-        logger.addHandler(fileHandler)
         logger.addHandler(streamHandler)
 
     return logger
 
 
+@functools.lru_cache(maxsize=8)
+def enable_file_logging(name: str = "main", logdir: str = "./logs"):
+    """
+    Attach the log file handler to a logger, once, unless LOG_TO_FILE is set to 0.
+
+    Parameters:
+        name (str): Name of the logger.
+        logdir (str): Directory to store log files.
+
+    The file `logdir`/logs.txt is written through a buffer flushed every 1024 records or on errors.
+    Called by the entry points, the CLI and the Streamlit app, once `.env` is loaded, so LOG_TO_FILE
+    can be set in either place.
+
+    Returns:
+        logger: The logger, with the file handler attached when enabled.
+    """
+    logger = getLogger(name)
+
+    # File logging can be disabled with LOG_TO_FILE=0
+    if os.getenv("LOG_TO_FILE", "1") == "0":
+        return logger
+
+    if not os.path.isdir(logdir):
+        os.mkdir(logdir)
+
+    fileHandler = logging.FileHandler(os.path.join(logdir, "logs.txt"))
+    fileHandler.setLevel(logging.DEBUG)
+    fileHandler.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT))
+
+    # Buffer records and write them in batches, flushing immediately on errors
+    memoryHandler = logging.handlers.MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=fileHandler)
+    memoryHandler.setLevel(logging.DEBUG)
+    logger.addHandler(memoryHandler)
+    return logger
+
+
 # a simple usecase
 if __name__ == "__main__":
-    logger = getLogger(loglevel="DEBUG")
+    logger = enable_file_logging()
+    logger.setLevel(logging.DEBUG)
     logger.debug("A message only developers care about")
     logger.info("Curious users might want to know this")
     logger.warning("Something is wrong and any user should be informed")
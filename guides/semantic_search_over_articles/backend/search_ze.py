@@ -1,17 +1,131 @@
 # search_ze.py
-from dotenv import load_dotenv
-from zeroentropy import AsyncZeroEntropy
-
-# Logger import
+import asyncio
+import copy
+import json
+import sys
+from typing import AsyncIterator, Iterator, Literal, Optional
+import orjson
+from cachetools import TTLCache
+
+# Internal imports
+from client_ze import close_client, configure_environment, get_client
 from logger import getLogger
 
-# Load environment variables
-load_dotenv()
-
 # Configure logger to display log messages
 logger = getLogger()
 
 
+# Fields of each search result type, with their defaults when missing from the response
+DOCUMENT_FIELDS = {"path": None, "score": None, "file_url": None, "metadata": None}
+SNIPPET_FIELDS = {
+    "path": None,
+    "score": None,
+    "start_index": 0,
+    "end_index": 0,
+    "page_span": [],
+    "content": "",
+    "metadata": None,
+}
+PAGE_FIELDS = {"path": None, "score": None, "page_index": 0, "content": "", "metadata": None}
+
+# Number of characters of page content kept in the content_preview field of page results
+CONTENT_PREVIEW_CHARS = 500
+
+
+# Console display templates, filled with the result fields merged over its metadata
+_DOCUMENT_TEMPLATE = "Result {i}\nDocument Path: {path}\nRelevance Score: {score:.4f}"
+_DOCUMENT_METADATA_TEMPLATE = (
+    "Title: {title}\nAuthor: {creator}\nPublication Date: {pub_date}\n"
+    "Categories: {categories}\nSource URL: {source_url}"
+)
+_SNIPPET_TEMPLATE = (
+    "Snippet {i}\nDocument Path: {path}\nRelevance Score: {score:.4f}\n"
+    "Character Range: {start_index}-{end_index}\nPage Span: {page_span}"
+)
+_PAGE_TEMPLATE = "Page {i}\nDocument Path: {path}\nPage Index: {page_index}\nRelevance Score: {score:.4f}"
+_CONTENT_TEMPLATE = "Content: {content:.300}..."
+_SHORT_METADATA_TEMPLATE = "Title: {title}\nAuthor: {creator}"
+
+
+class DefaultMissing(dict):
+    """Dictionary returning "N/A" for missing keys, used to fill the display templates with `str.format_map`."""
+
+    def __missing__(self, key):
+        return "N/A"
+
+
+def _iter_result_dicts(results: list, fields: dict) -> Iterator[dict]:
+    """
+    Convert SDK Result objects to dictionaries holding the given fields, one at a time.
+
+    Pydantic results are converted with a single `model_dump` call each, other objects fall back
+    to one `getattr` per field. Missing metadata is normalized to an empty dict.
+
+    Parameters
+    ----------
+    results : list
+        Result objects from a ZeroEntropy query response
+    fields : dict
+        Mapping of field names to their default values
+
+    Yields
+    ------
+    dict
+        Result dictionary
+    """
+    if not results:
+        return
+
+    if hasattr(results[0], "model_dump"):
+        include = set(fields)
+        for result in results:
+            result_dict = {**fields, **result.model_dump(include=include)}
+            result_dict["metadata"] = result_dict["metadata"] or {}
+            yield result_dict
+    else:
+        for result in results:
+            result_dict = {name: getattr(result, name, default) for name, default in fields.items()}
+            result_dict["metadata"] = result_dict["metadata"] or {}
+            yield result_dict
+
+
+def results_to_dicts(results: list, fields: dict) -> list:
+    """Convert SDK Result objects to a list of dictionaries, see `_iter_result_dicts`."""
+    return list(_iter_result_dicts(results, fields))
+
+
+def _copy_result(result: dict) -> dict:
+    """Copy a result dictionary along with its nested metadata, so a cached result cannot be changed from outside."""
+    return copy.deepcopy(result)
+
+
+def _json_default(obj):
+    """Serialize SDK models nested in results, such as Pydantic metadata objects."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def write_json_results(results: list) -> None:
+    """
+    Write search results to stdout as a single line of JSON, encoded with orjson.
+
+    Parameters
+    ----------
+    results : list
+        List of result dictionaries from any search method
+    """
+    payload = orjson.dumps(results, default=_json_default)
+    sys.stdout.flush()
+    sys.stdout.buffer.write(payload + b"\n")
+    sys.stdout.buffer.flush()
+
+
+def reranker_precision_body(reranker_precision: Optional[str]) -> Optional[dict]:
+    """Build the extra request body selecting the reranker precision, or None to keep the server default."""
+    return {"precision": reranker_precision} if reranker_precision else None
+
+
 class ZeroEntropyArticleSearcher:
     """
     ZeroEntropyArticleSearcher handles article searching using ZeroEntropy's advanced retrieval capabilities.
@@ -26,12 +140,97 @@ class ZeroEntropyArticleSearcher:
     collection_name : str
         The name of the ZeroEntropy collection
     zclient : AsyncZeroEntropy
-        The ZeroEntropy async client instance
+        The shared ZeroEntropy async client instance, see `client_ze.get_client`
+
+    Notes
+    -----
+    Search results are cached in memory for 60 seconds, keyed on the search parameters,
+    so repeated queries (pagination, refresh) skip the backend round trip. The cache holds its own
+    deep copies of the result dictionaries, metadata included, so callers may modify the results
+    they receive.
     """
 
     def __init__(self, collection_name: str = "articles"):
+        configure_environment()
         self.collection_name = collection_name
-        self.zclient = AsyncZeroEntropy()
+        self.zclient = get_client()
+        self._cache = TTLCache(maxsize=512, ttl=60)
+        self._cache_lock = asyncio.Lock()
+
+    @classmethod
+    async def aclose(cls):
+        """Close the shared ZeroEntropy client and its connection pool, typically at application shutdown."""
+        await close_client()
+
+    def _cache_key(self, search_type: str, query: str, k: int, filter_dict: dict, *params) -> tuple:
+        """Build a hashable cache key from the search parameters."""
+        filter_key = json.dumps(filter_dict, sort_keys=True) if filter_dict else None
+        return (search_type, self.collection_name, query, k, filter_key, *params)
+
+    async def search_documents_stream(
+        self,
+        query: str,
+        k: int = 10,
+        filter_dict: dict = None,
+        include_metadata: bool = True,
+        reranker: str = "zerank-1-small",
+        reranker_precision: Optional[Literal["bf16", "fp8", "int8"]] = None,
+    ) -> AsyncIterator[dict]:
+        """Search for documents using ZeroEntropy's top_documents query, yielding results one at a time.
+
+        Each result is converted and yielded as soon as the response arrives, so consumers can start
+        processing, or stop early, without waiting for the whole list. Results are cached only when
+        the stream is fully consumed.
+
+        Parameters
+        ----------
+        query : str
+            The search query string
+        k : int, optional
+            Number of top results to return, by default 10
+        filter_dict : dict, optional
+            Dictionary containing filters for metadata fields, by default None
+        include_metadata : bool, optional
+            Whether to include document metadata in results, by default True
+        reranker : str, optional
+            Name of the reranker model to use, by default "zerank-1-small"
+        reranker_precision : {"bf16", "fp8", "int8"}, optional
+            Numeric precision requested for the reranker, forwarded to the server when set, by default None
+
+        Yields
+        ------
+        Dict
+            Document result dictionary, see `search_documents`
+        """
+        key = self._cache_key(
+            "documents", query, k, filter_dict, include_metadata, reranker, reranker_precision
+        )
+        async with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            for result_dict in cached:
+                yield _copy_result(result_dict)
+            return
+
+        response = await self.zclient.queries.top_documents(
+            collection_name=self.collection_name,
+            query=query,
+            k=k,
+            filter=filter_dict,
+            include_metadata=include_metadata,
+            reranker=reranker,
+            latency_mode="low",
+            extra_body=reranker_precision_body(reranker_precision),
+        )
+
+        # Convert Result objects to dictionaries
+        results = []
+        for result_dict in _iter_result_dicts(response.results, DOCUMENT_FIELDS):
+            results.append(_copy_result(result_dict))
+            yield result_dict
+
+        async with self._cache_lock:
+            self._cache[key] = tuple(results)
 
     async def search_documents(
         self,
@@ -40,6 +239,7 @@ class ZeroEntropyArticleSearcher:
         filter_dict: dict = None,
         include_metadata: bool = True,
         reranker: str = "zerank-1-small",
+        reranker_precision: Optional[Literal["bf16", "fp8", "int8"]] = None,
     ) -> list:
         """Search for documents using ZeroEntropy's top_documents query.
 
@@ -55,6 +255,8 @@ class ZeroEntropyArticleSearcher:
             Whether to include document metadata in results, by default True
         reranker : str, optional
             Name of the reranker model to use, by default "zerank-1-small"
+        reranker_precision : {"bf16", "fp8", "int8"}, optional
+            Numeric precision requested for the reranker, forwarded to the server when set, by default None
 
         Returns
         -------
@@ -69,28 +271,17 @@ class ZeroEntropyArticleSearcher:
             - metadata : Dict
                 Document metadata including title, creator, categories, etc.
         """
-        response = await self.zclient.queries.top_documents(
-            collection_name=self.collection_name,
-            query=query,
-            k=k,
-            filter=filter_dict,
-            include_metadata=include_metadata,
-            reranker=reranker,
-            latency_mode="low",
-        )
-
-        # Convert Result objects to dictionaries
-        results = []
-        for result in response.results:
-            result_dict = {
-                'path': result.path,
-                'score': result.score,
-                'file_url': getattr(result, 'file_url', None),
-                'metadata': getattr(result, 'metadata', {})
-            }
-            results.append(result_dict)
-
-        return results
+        return [
+            result_dict
+            async for result_dict in self.search_documents_stream(
+                query=query,
+                k=k,
+                filter_dict=filter_dict,
+                include_metadata=include_metadata,
+                reranker=reranker,
+                reranker_precision=reranker_precision,
+            )
+        ]
 
     async def search_snippets(
         self,
@@ -99,6 +290,7 @@ class ZeroEntropyArticleSearcher:
         filter_dict: dict = None,
         precise_responses: bool = True,
         reranker: str = "zerank-1-small",
+        reranker_precision: Optional[Literal["bf16", "fp8", "int8"]] = None,
     ) -> list:
         """
         Search for specific snippets using ZeroEntropy's top_snippets query.
@@ -115,6 +307,8 @@ class ZeroEntropyArticleSearcher:
             Whether to return precise snippet boundaries, by default True
         reranker : str, optional
             Name of the reranker model to use, by default "zerank-1-small"
+        reranker_precision : {"bf16", "fp8", "int8"}, optional
+            Numeric precision requested for the reranker, forwarded to the server when set, by default None
 
         Returns
         -------
@@ -135,6 +329,14 @@ class ZeroEntropyArticleSearcher:
             - metadata : Dict
                 Document metadata including title, creator, categories, etc.
         """
+        key = self._cache_key(
+            "snippets", query, k, filter_dict, precise_responses, reranker, reranker_precision
+        )
+        async with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return [_copy_result(result) for result in cached]
+
         response = await self.zclient.queries.top_snippets(
             collection_name=self.collection_name,
             query=query,
@@ -143,21 +345,14 @@ class ZeroEntropyArticleSearcher:
             precise_responses=precise_responses,
             include_document_metadata=True,
             reranker=reranker,
+            extra_body=reranker_precision_body(reranker_precision),
         )
 
         # Convert Result objects to dictionaries
-        results = []
-        for result in response.results:
-            result_dict = {
-                'path': result.path,
-                'score': result.score,
-                'start_index': getattr(result, 'start_index', 0),
-                'end_index': getattr(result, 'end_index', 0),
-                'page_span': getattr(result, 'page_span', []),
-                'content': getattr(result, 'content', ''),
-                'metadata': getattr(result, 'metadata', {})
-            }
-            results.append(result_dict)
+        results = results_to_dicts(response.results, SNIPPET_FIELDS)
+
+        async with self._cache_lock:
+            self._cache[key] = tuple(_copy_result(result) for result in results)
 
         return results
 
@@ -194,9 +389,17 @@ class ZeroEntropyArticleSearcher:
                 Index of the page within the document (0-based)
             - content : str
                 The text content of the page (if include_content=True)
+            - content_preview : str
+                The content truncated to CONTENT_PREVIEW_CHARS characters, for display
             - metadata : Dict
                 Document metadata including title, creator, categories, etc.
         """
+        key = self._cache_key("pages", query, k, filter_dict, include_content)
+        async with self._cache_lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            return [_copy_result(result) for result in cached]
+
         response = await self.zclient.queries.top_pages(
             collection_name=self.collection_name,
             query=query,
@@ -206,17 +409,16 @@ class ZeroEntropyArticleSearcher:
             latency_mode="low",
         )
 
-        # Convert Result objects to dictionaries
-        results = []
-        for result in response.results:
-            result_dict = {
-                'path': result.path,
-                'score': result.score,
-                'page_index': getattr(result, 'page_index', 0),
-                'content': getattr(result, 'content', ''),
-                'metadata': getattr(result, 'metadata', {})
-            }
-            results.append(result_dict)
+        # Convert Result objects to dictionaries, with a truncated preview of the content
+        results = results_to_dicts(response.results, PAGE_FIELDS)
+        for result in results:
+            content = result["content"] or ""
+            result["content_preview"] = (
+                content[:CONTENT_PREVIEW_CHARS] + "..." if len(content) > CONTENT_PREVIEW_CHARS else content
+            )
+
+        async with self._cache_lock:
+            self._cache[key] = tuple(_copy_result(result) for result in results)
 
         return results
 
@@ -236,30 +438,30 @@ class ZeroEntropyArticleSearcher:
             print(f"No results found for query: '{query}'")
             return
 
-        print(f"\n{'=' * 60}")
-        print(f"DOCUMENT SEARCH RESULTS FOR: '{query}'")
-        print(f"Found {len(results)} results")
-        print(f"{'=' * 60}\n")
+        out = [
+            f"\n{'=' * 60}",
+            f"DOCUMENT SEARCH RESULTS FOR: '{query}'",
+            f"Found {len(results)} results",
+            f"{'=' * 60}\n",
+        ]
 
         for i, result in enumerate(results, 1):
-            print(f"Result {i}")
-            print(f"Document Path: {result['path']}")
-            print(f"Relevance Score: {result['score']:.4f}")
-
-            if result.get("metadata"):
-                metadata = result["metadata"]
-                print(f"Title: {metadata.get('title', 'N/A')}")
-                print(f"Author: {metadata.get('creator', 'N/A')}")
-                print(f"Publication Date: {metadata.get('pub_date', 'N/A')}")
-                print(f"Categories: {metadata.get('categories', 'N/A')}")
-                print(f"Source URL: {metadata.get('source_url', 'N/A')}")
+            metadata = result.get("metadata") or {}
+            fields = DefaultMissing(metadata, **result, i=i)
+            out.append(_DOCUMENT_TEMPLATE.format_map(fields))
+
+            if metadata:
+                out.append(_DOCUMENT_METADATA_TEMPLATE.format_map(fields))
 
             # NOTE: file_url contains sensitive tokens - UNCOMMENT ONLY FOR DEBUGGING/TESTING
             if result.get("file_url"):
-                # print(f"File URL: {result['file_url']}")
-                print("File URL: [Available - hidden for security]")
+                # out.append(f"File URL: {result['file_url']}")
+                out.append("File URL: [Available - hidden for security]")
 
-            print("\n" + "-" * 50 + "\n")
+            out.append("\n" + "-" * 50 + "\n")
+
+        # Emit the whole report in a single write
+        sys.stdout.write("\n".join(out) + "\n")
 
     @staticmethod
     def display_snippet_results(results: list, query: str):
@@ -276,27 +478,28 @@ class ZeroEntropyArticleSearcher:
             print(f"No snippets found for query: '{query}'")
             return
 
-        print(f"\n{'=' * 60}")
-        print(f"SNIPPET SEARCH RESULTS FOR: '{query}'")
-        print(f"Found {len(results)} snippets")
-        print(f"{'=' * 60}\n")
+        out = [
+            f"\n{'=' * 60}",
+            f"SNIPPET SEARCH RESULTS FOR: '{query}'",
+            f"Found {len(results)} snippets",
+            f"{'=' * 60}\n",
+        ]
 
         for i, result in enumerate(results, 1):
-            print(f"Snippet {i}")
-            print(f"Document Path: {result['path']}")
-            print(f"Relevance Score: {result['score']:.4f}")
-            print(f"Character Range: {result['start_index']}-{result['end_index']}")
-            print(f"Page Span: {result['page_span']}")
+            metadata = result.get("metadata") or {}
+            fields = DefaultMissing(metadata, **result, i=i)
+            out.append(_SNIPPET_TEMPLATE.format_map(fields))
 
             if result.get("content"):
-                print(f"Content: {result['content'][:300]}...")
+                out.append(_CONTENT_TEMPLATE.format_map(fields))
+
+            if metadata:
+                out.append(_SHORT_METADATA_TEMPLATE.format_map(fields))
 
-            if result.get("metadata"):
-                metadata = result["metadata"]
-                print(f"Title: {metadata.get('title', 'N/A')}")
-                print(f"Author: {metadata.get('creator', 'N/A')}")
+            out.append("\n" + "-" * 40 + "\n")
 
-            print("\n" + "-" * 40 + "\n")
+        # Emit the whole report in a single write
+        sys.stdout.write("\n".join(out) + "\n")
 
     @staticmethod
     def display_page_results(results: list, query: str):
@@ -314,26 +517,28 @@ class ZeroEntropyArticleSearcher:
             print(f"No page results found for query: '{query}'")
             return
 
-        print(f"\n{'=' * 60}")
-        print(f"PAGE SEARCH RESULTS FOR: '{query}'")
-        print(f"Found {len(results)} page results")
-        print(f"{'=' * 60}\n")
+        out = [
+            f"\n{'=' * 60}",
+            f"PAGE SEARCH RESULTS FOR: '{query}'",
+            f"Found {len(results)} page results",
+            f"{'=' * 60}\n",
+        ]
 
         for i, result in enumerate(results, 1):
-            print(f"Page {i}")
-            print(f"Document Path: {result['path']}")
-            print(f"Page Index: {result['page_index']}")
-            print(f"Relevance Score: {result['score']:.4f}")
+            metadata = result.get("metadata") or {}
+            fields = DefaultMissing(metadata, **result, i=i)
+            out.append(_PAGE_TEMPLATE.format_map(fields))
 
             if result.get("content"):
-                print(f"Content: {result['content'][:300]}...")
+                out.append(_CONTENT_TEMPLATE.format_map(fields))
+
+            if metadata:
+                out.append(_SHORT_METADATA_TEMPLATE.format_map(fields))
 
-            if result.get("metadata"):
-                metadata = result["metadata"]
-                print(f"Title: {metadata.get('title', 'N/A')}")
-                print(f"Author: {metadata.get('creator', 'N/A')}")
+            out.append("\n" + "-" * 40 + "\n")
 
-            print("\n" + "-" * 40 + "\n")
+        # Emit the whole report in a single write
+        sys.stdout.write("\n".join(out) + "\n")
 
     async def get_collection_status(self):
         """Get and display collection status information.
@@ -1,16 +1,38 @@
 # utils_ze.py
-from dotenv import load_dotenv
-from zeroentropy import AsyncZeroEntropy
-
-# Logger import
+import asyncio
+import sys
+from collections import defaultdict
+from typing import AsyncIterator, Literal, Optional, Tuple
+from cachetools import TTLCache
+
+# Internal imports
+from client_ze import collection_sentinel, configure_environment, get_client
+from search_ze import DOCUMENT_FIELDS, DefaultMissing, reranker_precision_body, results_to_dicts
 from logger import getLogger
 
-# Load environment variables
-load_dotenv()
-
 # Configure logger to display log messages
 logger = getLogger()
 
+# Maximum number of documents sent in a single rerank request
+RERANK_BATCH_SIZE = 32
+
+# Maximum number of characters of each document sent to the reranker
+RERANK_MAX_CHARS = 2048
+
+# Seconds a cached document info stays valid, documents may be changed by other clients meanwhile
+DOCINFO_TTL = 300
+
+# Pages retrieved per candidate document in advanced search, so the page query covers the whole pool
+RERANK_PAGES_PER_DOCUMENT = 4
+
+# Console display templates, filled with the result fields merged over its metadata
+_ADVANCED_TEMPLATE = (
+    "Result {i}\nDocument Path: {path}\nOriginal Score: {original_score:.4f}\nRerank Score: {rerank_score:.4f}"
+)
+_ADVANCED_METADATA_TEMPLATE = (
+    "Title: {title}\nAuthor: {creator}\nPublication Date: {pub_date}\nCategories: {categories}"
+)
+
 
 class ZeroEntropyUtils:
     """
@@ -26,11 +48,26 @@ class ZeroEntropyUtils:
     collection_name : str
         The default collection name for operations
     zclient : AsyncZeroEntropy
-        The ZeroEntropy async client instance
+        The shared ZeroEntropy async client instance, see `client_ze.get_client`
     """
     def __init__(self, collection_name: str = "articles"):
+        configure_environment()
         self.collection_name = collection_name
-        self.zclient = AsyncZeroEntropy()
+        self.zclient = get_client()
+        self._delete_sem = asyncio.Semaphore(20)
+        self._update_sem = asyncio.Semaphore(20)
+        self._docinfo_cache = TTLCache(maxsize=2048, ttl=DOCINFO_TTL)
+        self._docinfo_locks = {}
+
+    def _invalidate_document_info(self, path: str):
+        """Drop every cached document info entry of the given path."""
+        for key in [key for key in self._docinfo_cache if key[1] == path]:
+            self._docinfo_cache.pop(key, None)
+
+    def _invalidate_collection_info(self, collection_name: str):
+        """Drop every cached document info entry of the given collection."""
+        for key in [key for key in self._docinfo_cache if key[0] == collection_name]:
+            self._docinfo_cache.pop(key, None)
 
     async def rerank_documents(
         self,
@@ -38,10 +75,14 @@ class ZeroEntropyUtils:
         document_texts: list,
         model: str = "zerank-1-small",
         top_n: int = 10,
+        reranker_precision: Optional[Literal["bf16", "fp8", "int8"]] = None,
     ) -> list:
         """
         Use ZeroEntropy's reranking model to rerank a list of documents.
 
+        Documents are truncated to RERANK_MAX_CHARS characters. Lists longer than RERANK_BATCH_SIZE are
+        split into sub-batches reranked concurrently, then merged by relevance score.
+
         Parameters
         ----------
         query : str
@@ -52,6 +93,8 @@ class ZeroEntropyUtils:
             Name of the reranking model to use, by default "zerank-1-small"
         top_n : int, optional
             Number of top reranked results to return, by default 10
+        reranker_precision : {"bf16", "fp8", "int8"}, optional
+            Numeric precision requested for the reranker, forwarded to the server when set, by default None
 
         Returns
         -------
@@ -62,10 +105,45 @@ class ZeroEntropyUtils:
             - relevance_score : float
                 Reranking relevance score for the document
         """
-        response = await self.zclient.models.rerank(
-            query=query, documents=document_texts, model=model, top_n=top_n
+        # Truncate documents, the reranker relevance is insensitive to long tails
+        document_texts = [text[:RERANK_MAX_CHARS] for text in document_texts]
+
+        if len(document_texts) <= RERANK_BATCH_SIZE:
+            response = await self.zclient.models.rerank(
+                query=query,
+                documents=document_texts,
+                model=model,
+                top_n=top_n,
+                extra_body=reranker_precision_body(reranker_precision),
+            )
+            return [
+                {"index": result.index, "relevance_score": result.relevance_score}
+                for result in response.results
+            ]
+
+        # Rerank large candidate pools in concurrent sub-batches
+        offsets = range(0, len(document_texts), RERANK_BATCH_SIZE)
+        responses = await asyncio.gather(
+            *[
+                self.zclient.models.rerank(
+                    query=query,
+                    documents=document_texts[offset:offset + RERANK_BATCH_SIZE],
+                    model=model,
+                    top_n=min(top_n, len(document_texts[offset:offset + RERANK_BATCH_SIZE])),
+                    extra_body=reranker_precision_body(reranker_precision),
+                )
+                for offset in offsets
+            ]
         )
-        return response.results
+
+        # Map each batch result back to its global document index and merge by relevance
+        results = [
+            {"index": offset + result.index, "relevance_score": result.relevance_score}
+            for offset, response in zip(offsets, responses)
+            for result in response.results
+        ]
+        results.sort(key=lambda result: result["relevance_score"], reverse=True)
+        return results[:top_n]
 
     async def list_all_collections(self) -> list:
         """
@@ -81,7 +159,7 @@ class ZeroEntropyUtils:
 
     async def delete_collection(self, collection_name: str) -> bool:
         """
-        Delete a collection from ZeroEntropy.
+        Delete a collection from ZeroEntropy, along with its local initialization sentinel file.
 
         Parameters
         ----------
@@ -94,6 +172,8 @@ class ZeroEntropyUtils:
             True if deletion was successful
         """
         await self.zclient.collections.delete(collection_name=collection_name)
+        collection_sentinel(collection_name).unlink(missing_ok=True)
+        self._invalidate_collection_info(collection_name)
         logger.info(f"Successfully deleted collection: {collection_name}")
         return True
 
@@ -149,16 +229,37 @@ class ZeroEntropyUtils:
         Optional[Dict]
             Dictionary containing document information including metadata, status,
             and optionally the full content. Returns None if document not found.
+
+        Notes
+        -----
+        Results are kept for DOCINFO_TTL seconds in a cache of 2048 entries keyed on
+        (collection_name, path, include_content), invalidated when the document is updated or deleted, or
+        its collection deleted, through this class. Changes made by other clients, such as the indexer
+        re-adding a document, are seen once the entry expires.
         """
         if collection_name is None:
             collection_name = self.collection_name
 
-        response = await self.zclient.documents.get_info(
-            collection_name=collection_name,
-            path=path,
-            include_content=include_content,
-        )
-        return response.document
+        key = (collection_name, path, include_content)
+        if key in self._docinfo_cache:
+            return self._docinfo_cache[key]
+
+        # Coalesce concurrent misses on the same document into a single request
+        lock = self._docinfo_locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                if key in self._docinfo_cache:
+                    return self._docinfo_cache[key]
+
+                response = await self.zclient.documents.get_info(
+                    collection_name=collection_name,
+                    path=path,
+                    include_content=include_content,
+                )
+                self._docinfo_cache[key] = response.document
+                return response.document
+        finally:
+            self._docinfo_locks.pop(key, None)
 
     async def update_document_metadata(
         self, path: str, metadata: dict, collection_name: str = None
@@ -187,9 +288,50 @@ class ZeroEntropyUtils:
         await self.zclient.documents.update(
             collection_name=collection_name, path=path, metadata=metadata
         )
+        self._invalidate_document_info(path)
         logger.info(f"Successfully updated metadata for document: {path}")
         return True
 
+    async def batch_update_metadata(
+        self, updates: dict, collection_name: str = None
+    ) -> dict:
+        """
+        Update the metadata of multiple documents in batch operation.
+
+        Parameters
+        ----------
+        updates : Dict[str, Dict[str, str]]
+            Dictionary mapping each document path to the metadata keys and values to update
+        collection_name : str, optional
+            Name of the collection containing the documents. If None, uses the default
+            collection name, by default None
+
+        Returns
+        -------
+        Dict[str, bool]
+            Dictionary mapping each document path to its update success status.
+            True indicates successful update, False indicates failure.
+        """
+        if collection_name is None:
+            collection_name = self.collection_name
+
+        async def _one(path: str, metadata: dict):
+            async with self._update_sem:
+                await self.zclient.documents.update(
+                    collection_name=collection_name, path=path, metadata=metadata
+                )
+                self._invalidate_document_info(path)
+
+        # Dispatch updates concurrently, bounded by the semaphore
+        outcomes = await asyncio.gather(
+            *[_one(path, metadata) for path, metadata in updates.items()],
+            return_exceptions=True,
+        )
+        results = {path: not isinstance(outcome, Exception) for path, outcome in zip(updates, outcomes)}
+        logger.info("Updated metadata for %d/%d documents", sum(results.values()), len(results))
+
+        return results
+
     async def delete_document(
         self, path: str, collection_name: str = None
     ) -> bool:
@@ -215,6 +357,7 @@ class ZeroEntropyUtils:
         await self.zclient.documents.delete(
             collection_name=collection_name, path=path
         )
+        self._invalidate_document_info(path)
         logger.info(f"Successfully deleted document: {path}")
         return True
 
@@ -241,22 +384,42 @@ class ZeroEntropyUtils:
         if collection_name is None:
             collection_name = self.collection_name
 
-        results = {}
-        for path in paths:
-            success = await self.delete_document(path, collection_name)
-            results[path] = success
+        async def _one(path: str):
+            async with self._delete_sem:
+                try:
+                    await self.zclient.documents.delete(collection_name=collection_name, path=path)
+                    self._invalidate_document_info(path)
+                    return path, True
+                except Exception:
+                    return path, False
+
+        # Dispatch deletions concurrently, bounded by the semaphore
+        pairs = await asyncio.gather(*[_one(path) for path in paths])
+        results = dict(pairs)
+        logger.info("Deleted %d/%d documents", sum(results.values()), len(results))
 
         return results
 
-    async def search_and_rerank(
+    async def search_and_rerank_stream(
         self,
         query: str,
         k: int = 20,
         rerank_top_n: int = 10,
         collection_name: str = None,
-    ) -> list:
+        reranker_precision: Optional[Literal["bf16", "fp8", "int8"]] = None,
+    ) -> AsyncIterator[Tuple[str, list]]:
         """
-        Advanced search that first retrieves more documents, then reranks them for improved relevance.
+        Advanced search yielding its intermediate stages, so callers can show the retrieved documents
+        while the reranking is still running.
+
+        Documents are retrieved with concurrent top_documents and top_pages queries, then reranked, so
+        the search always takes two round trips. The page query asks for RERANK_PAGES_PER_DOCUMENT pages
+        per candidate so that it covers the pool.
+
+        Every candidate is reranked on the same kind of text: its title followed by its retrieved pages,
+        in page order. These are the passages matching the query and keep the rerank payload small, but
+        relevance located elsewhere in a long document is not seen by the reranker, and a document with
+        no retrieved page is scored on its title alone.
 
         Parameters
         ----------
@@ -269,62 +432,81 @@ class ZeroEntropyUtils:
         collection_name : str, optional
             Name of the collection to search in. If None, uses the default
             collection name, by default None
-
-        Returns
-        -------
-        list
-            List of reranked document result dictionaries, each containing:
-            - All original document fields (path, metadata, etc.)
-            - original_score : float
-                The original search relevance score
-            - rerank_score : float
-                The improved relevance score from reranking
+        reranker_precision : {"bf16", "fp8", "int8"}, optional
+            Numeric precision requested for the reranker, forwarded to the server when set, by default None
+
+        Yields
+        ------
+        Tuple[str, list]
+            - ("retrieval", results) : the retrieved document result dictionaries, in their original order,
+              with the fields of `ZeroEntropyArticleSearcher.search_documents`
+            - ("rerank", results) : the reranked results, see `search_and_rerank`
         """
         if collection_name is None:
             collection_name = self.collection_name
 
-        # First, get more documents than needed
-        search_results = await self.zclient.queries.top_documents(
-            collection_name=collection_name,
-            query=query,
-            k=k,
-            include_metadata=True,
-            latency_mode="low",
+        # First, get more documents than needed, along with their page contents in the same round trip
+        search_results, page_results = await asyncio.gather(
+            self.zclient.queries.top_documents(
+                collection_name=collection_name,
+                query=query,
+                k=k,
+                include_metadata=True,
+                latency_mode="low",
+            ),
+            self.zclient.queries.top_pages(
+                collection_name=collection_name,
+                query=query,
+                k=k * RERANK_PAGES_PER_DOCUMENT,
+                include_content=True,
+                latency_mode="low",
+            ),
         )
 
-        if not search_results.results:
-            return []
+        # Convert Result objects to dictionaries before indexing them
+        documents = results_to_dicts(search_results.results, DOCUMENT_FIELDS)
+
+        yield "retrieval", documents
+        if not documents:
+            yield "rerank", []
+            return
+
+        # Aggregate the retrieved pages into one text per document path, in page order
+        pages_by_path = defaultdict(list)
+        for page in page_results.results:
+            if getattr(page, "content", None):
+                pages_by_path[page.path].append((getattr(page, "page_index", None) or 0, page.content))
 
-        # Extract document texts for reranking
+        # Build the rerank text of every candidate the same way, keeping the results aligned with the
+        # reranked indexes
+        candidates = []
         document_texts = []
-        for result in search_results.results:
-            # Get full document content
-            doc_info = await self.get_document_info(
-                path=result["path"],
-                collection_name=collection_name,
-                include_content=True,
-            )
-            if doc_info and doc_info.get("content"):
-                document_texts.append(doc_info["content"])
-            else:
-                # Fallback to using metadata if content not available
-                metadata = result.get("metadata", {})
-                fallback_text = (
-                    f"{metadata.get('title', '')} {metadata.get('description', '')}"
-                )
-                document_texts.append(fallback_text)
+        for result in documents:
+            metadata = result.get("metadata") or {}
+            pages = [content for _, content in sorted(pages_by_path.get(result["path"], ()))]
+            text = "\n".join(part for part in (metadata.get("title"), *pages) if part)
+            # A blank document gains nothing from reranking and still costs tokens
+            if not text:
+                continue
+            candidates.append(result)
+            document_texts.append(text)
+
+        if not document_texts:
+            yield "rerank", []
+            return
 
         # Rerank the documents
         rerank_results = await self.rerank_documents(
             query=query,
             document_texts=document_texts,
             top_n=min(rerank_top_n, len(document_texts)),
+            reranker_precision=reranker_precision,
         )
 
         # Combine rerank results with original metadata
         final_results = []
         for rerank_result in rerank_results:
-            original_result = search_results.results[rerank_result["index"]]
+            original_result = candidates[rerank_result["index"]]
             final_results.append(
                 {
                     **original_result,
@@ -333,6 +515,56 @@ class ZeroEntropyUtils:
                 }
             )
 
+        yield "rerank", final_results
+
+    async def search_and_rerank(
+        self,
+        query: str,
+        k: int = 20,
+        rerank_top_n: int = 10,
+        collection_name: str = None,
+        reranker_precision: Optional[Literal["bf16", "fp8", "int8"]] = None,
+    ) -> list:
+        """
+        Advanced search that first retrieves more documents, then reranks them for improved relevance.
+
+        Runs `search_and_rerank_stream` and keeps its final stage, see there for how candidates are
+        retrieved and which text the reranker scores.
+
+        Parameters
+        ----------
+        query : str
+            The search query string
+        k : int, optional
+            Number of initial documents to retrieve before reranking, by default 20
+        rerank_top_n : int, optional
+            Number of top documents to return after reranking, by default 10
+        collection_name : str, optional
+            Name of the collection to search in. If None, uses the default
+            collection name, by default None
+        reranker_precision : {"bf16", "fp8", "int8"}, optional
+            Numeric precision requested for the reranker, forwarded to the server when set, by default None
+
+        Returns
+        -------
+        list
+            List of reranked document result dictionaries, each containing:
+            - All original document fields (path, metadata, etc.)
+            - original_score : float
+                The original search relevance score
+            - rerank_score : float
+                The improved relevance score from reranking
+        """
+        final_results = []
+        async for stage, results in self.search_and_rerank_stream(
+            query=query,
+            k=k,
+            rerank_top_n=rerank_top_n,
+            collection_name=collection_name,
+            reranker_precision=reranker_precision,
+        ):
+            if stage == "rerank":
+                final_results = results
         return final_results
 
     def display_advanced_results(self, results: list, query: str):
@@ -350,22 +582,22 @@ class ZeroEntropyUtils:
             print(f"No results found for query: '{query}'")
             return
 
-        print(f"\n{'='*70}")
-        print(f"ADVANCED SEARCH & RERANK RESULTS FOR: '{query}'")
-        print(f"Found {len(results)} results")
-        print(f"{'='*70}\n")
+        out = [
+            f"\n{'='*70}",
+            f"ADVANCED SEARCH & RERANK RESULTS FOR: '{query}'",
+            f"Found {len(results)} results",
+            f"{'='*70}\n",
+        ]
 
         for i, result in enumerate(results, 1):
-            print(f"Result {i}")
-            print(f"Document Path: {result['path']}")
-            print(f"Original Score: {result['original_score']:.4f}")
-            print(f"Rerank Score: {result['rerank_score']:.4f}")
-
-            if result.get("metadata"):
-                metadata = result["metadata"]
-                print(f"Title: {metadata.get('title', 'N/A')}")
-                print(f"Author: {metadata.get('creator', 'N/A')}")
-                print(f"Publication Date: {metadata.get('pub_date', 'N/A')}")
-                print(f"Categories: {metadata.get('categories', 'N/A')}")
-
-            print("\n" + "-" * 60 + "\n")
+            metadata = result.get("metadata") or {}
+            fields = DefaultMissing(metadata, **result, i=i)
+            out.append(_ADVANCED_TEMPLATE.format_map(fields))
+
+            if metadata:
+                out.append(_ADVANCED_METADATA_TEMPLATE.format_map(fields))
+
+            out.append("\n" + "-" * 60 + "\n")
+
+        # Emit the whole report in a single write
+        sys.stdout.write("\n".join(out) + "\n")
@@ -1,21 +1,188 @@
 # streamlit_app.py
 import os
 import sys
+import copy
+import atexit
+import time
+import queue
+import functools
 import asyncio
+import threading
+from collections import OrderedDict
+import jinja2
+import pandas as pd
 import streamlit as st
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Set the working directory to the backend
+# Put the backend directory on the path, backend modules import each other by their flat names
+# (search_ze, logger), so importing them as backend.* would load a second copy of each module
 current_dir = os.path.dirname(os.path.abspath(__file__))
-backend_path = os.path.abspath(os.path.join(current_dir, "../..", "backend"))
-sys.path.append(backend_path)
+backend_path = os.path.abspath(os.path.join(current_dir, "..", "backend"))
+if backend_path not in sys.path:
+    sys.path.insert(0, backend_path)
 
 # Internal imports
-from backend.search_ze import ZeroEntropyArticleSearcher  # noqa: E402
-from backend.utils_ze import ZeroEntropyUtils  # noqa: E402
+from cache_ze import SemanticQueryCache  # noqa: E402
+from logger import enable_file_logging  # noqa: E402
+from search_ze import DefaultMissing, ZeroEntropyArticleSearcher  # noqa: E402
+from utils_ze import ZeroEntropyUtils  # noqa: E402
+
+# Attach the log file handler, once .env is loaded, unless LOG_TO_FILE=0
+enable_file_logging()
+
+
+async def shutdown():
+    """Close the ZeroEntropy client shared by every cached searcher and utils.
+
+    Searchers and utils both get their client from client_ze.get_client, imported once under its flat
+    name above, so closing that single process-wide client releases every connection.
+    """
+    await ZeroEntropyArticleSearcher.aclose()
+
+
+def _stop_event_loop(loop):
+    """At interpreter exit, close the client on its own loop so its sockets are released, then stop the loop"""
+    try:
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+
+
+# Cache a persistent event loop so the ZeroEntropy client keeps its connection pool across reruns
+@st.cache_resource
+def get_event_loop():
+    """Start and cache an event loop running forever in a background thread"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="zeroentropy-loop", daemon=True).start()
+    atexit.register(_stop_event_loop, loop)
+    return loop
+
+
+def run_coroutine(coro):
+    """Run a coroutine on the persistent event loop and wait for its result"""
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    return future.result()
+
+
+def request_cancel():
+    """Cancel button callback, run at the start of the rerun that interrupted the search, to report it.
+
+    The cancellation is only reported when a search was in flight, see `run_cancellable`.
+    """
+    if st.session_state.get("search_running", False):
+        st.session_state["cancel_search"] = True
+
+
+def run_cancellable(coro, on_poll=None, poll_interval: float = 0.05):
+    """Run a coroutine on the persistent event loop, polling it so the search can be cancelled.
+
+    Clicking Cancel requests a rerun, which Streamlit delivers by raising a stop exception at the next
+    Streamlit call of this script run. The poll loop refreshes the elapsed time every second, so the
+    run is interrupted within about a second, and the finally block then cancels the backend task
+    instead of leaving it running in the background.
+
+    The search_running session flag is set while the search is in flight. It is left set when the run
+    is interrupted, so the Cancel callback of the next rerun knows a search was running, and the main
+    script clears it once the callbacks have run.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    elapsed_placeholder = st.empty()
+    start = time.monotonic()
+    shown = None
+    st.session_state["search_running"] = True
+    interrupted = True
+    try:
+        while not future.done():
+            if on_poll is not None:
+                on_poll()
+            elapsed = int(time.monotonic() - start)
+            if elapsed != shown:
+                elapsed_placeholder.caption(f"⏱️ {elapsed}s elapsed")
+                shown = elapsed
+            time.sleep(poll_interval)
+        if on_poll is not None:
+            on_poll()
+        interrupted = False
+        return future.result()
+    finally:
+        future.cancel()
+        if not interrupted:
+            st.session_state["search_running"] = False
+        elapsed_placeholder.empty()
+
+
+class QueryCache:
+    """Thread-safe LRU cache with TTL for search results, with hit/miss statistics"""
+
+    def __init__(self, maxsize: int = 2000, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        """Return a copy of the cached results for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: tuple, results):
+        """Store results under key, evicting the least recently used entry when full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached entry and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return the cache size, hits, misses and hit rate"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+# Cache the query cache itself so it survives Streamlit reruns
+@st.cache_resource
+def get_query_cache():
+    """Initialize and cache the search results cache"""
+    return QueryCache(maxsize=2000, ttl=300.0)
+
+
+# Cache the semantic cache so its embedding model is loaded once per server process
+@st.cache_resource
+def get_semantic_cache():
+    """Initialize and cache the semantic query cache, disabled when faiss or sentence-transformers are missing.
+
+    The embedding model is loaded in a background thread, so the page does not wait for it and only a
+    search arriving before the load is done waits, without holding the cache lock of other sessions.
+    """
+    semantic_cache = SemanticQueryCache(maxsize=500, ttl=300.0)
+    threading.Thread(target=semantic_cache.load, name="semantic-cache-load", daemon=True).start()
+    return semantic_cache
 
 
 # Cache the searcher and utils to avoid reinitializing
@@ -27,56 +194,129 @@ def get_searcher_and_utils(collection_name="articles"):
     return searcher, utils
 
 
-async def get_search_results(
+def _build_filter(filter_creator: str = None, filter_category: str = None):
+    """Build the metadata filter of the given creator and category, or None when there is none.
+
+    The filter is a hashable tuple of (field, value) equality conditions, so equivalent filters share
+    one cache key, and it is expanded into a fresh SDK dict by `_filter_dict`.
+    """
+    conditions = (("creator", filter_creator), ("categories", filter_category))
+    return tuple((field, value) for field, value in conditions if value) or None
+
+
+def _filter_dict(conditions: tuple = None):
+    """Expand the conditions of `_build_filter` into the metadata filter dict of the SDK, or None"""
+    return {field: {"$eq": value} for field, value in conditions} if conditions else None
+
+
+# Maximum time allowed for a fanout of concurrent queries, in seconds
+FANOUT_TIMEOUT = 60.0
+
+
+def default_rerank_pool(k: int) -> int:
+    """Number of candidates retrieved for reranking in advanced search.
+
+    The pool holds at least k + 10 candidates, grows as 1.5 * k, and is capped at 50.
+
+    A larger pool gives the reranker more chances to surface relevant documents (recall), at the
+    cost of reranking time and payload, which grow linearly with the pool.
+    """
+    return min(max(k + 10, int(1.5 * k)), 50)
+
+
+async def search_single_query(
+    searcher,
+    utils,
     query: str,
     search_type: str,
     k: int,
-    collection_name: str,
-    filter_creator: str = None,
-    filter_category: str = None,
+    filter_dict: dict = None,
     reranker: str = "zerank-1-small",
+    rerank_pool: int = None,
 ):
-    """Async search function that uses ZeroEntropy backend functionality"""
-    searcher, utils = get_searcher_and_utils(collection_name)
-
-    # Prepare filter if specified
-    filter_dict = {}
-    if filter_creator:
-        filter_dict["creator"] = {"$eq": filter_creator}
-    if filter_category:
-        filter_dict["categories"] = {"$eq": filter_category}
-    filter_dict = filter_dict if filter_dict else None
-
-    # Perform search based on type
+    """Run a single query with the given search type"""
     if search_type == "documents":
-        results = await searcher.search_documents(
+        return await searcher.search_documents(
             query=query,
             k=k,
             filter_dict=filter_dict,
             reranker=reranker,
         )
     elif search_type == "snippets":
-        results = await searcher.search_snippets(
+        return await searcher.search_snippets(
             query=query,
             k=k,
             filter_dict=filter_dict,
             reranker=reranker,
         )
     elif search_type == "pages":
-        results = await searcher.search_pages(
+        return await searcher.search_pages(
             query=query, k=k, filter_dict=filter_dict
         )
     elif search_type == "advanced":
-        results = await utils.search_and_rerank(
-            query=query, k=k * 2, rerank_top_n=k  # Get more documents initially
+        return await utils.search_and_rerank(
+            query=query, k=rerank_pool or default_rerank_pool(k), rerank_top_n=k
         )
-    else:
-        results = []
-
-    return results, search_type
+    return []
+
+
+def merge_results(result_lists, k: int):
+    """Merge the results of several queries, keeping the best score of each duplicate and the top k overall"""
+    merged = {}
+    for results in result_lists:
+        for result in results:
+            # Snippets and pages of the same document are distinct results
+            key = (result.get("path"), result.get("start_index"), result.get("page_index"))
+            score = result.get("rerank_score", result.get("score")) or 0
+            best = merged.get(key)
+            if best is None or score > best[0]:
+                merged[key] = (score, result)
+    ranked = sorted(merged.values(), key=lambda item: item[0], reverse=True)
+    return [result for _, result in ranked[:k]]
+
+
+# Search types launched alongside the selected one when the fallback cascade is enabled
+FALLBACK_SEARCH_TYPES = ("documents", "snippets", "pages")
+
+
+async def search_with_fallback(search, search_type: str):
+    """Run the selected search type and the fallback types concurrently.
+
+    Returns (results, type) of the selected type when it has results, otherwise of the first
+    fallback type to complete with results. Pending searches are cancelled once a result is chosen.
+    """
+
+    async def _tagged(stype):
+        try:
+            return stype, await search(stype)
+        except Exception:
+            # A failing fallback counts as empty, only errors of the selected type are raised
+            if stype == search_type:
+                raise
+            return stype, []
+
+    search_types = [search_type] + [t for t in FALLBACK_SEARCH_TYPES if t != search_type]
+    tasks = [asyncio.create_task(_tagged(t)) for t in search_types]
+    selected_done = False
+    fallback = None
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            stype, results = await next_done
+            if stype == search_type:
+                if results:
+                    return results, stype
+                selected_done = True
+            elif results and fallback is None:
+                fallback = (results, stype)
+            if selected_done and fallback is not None:
+                return fallback
+        return fallback or ([], search_type)
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
-def run_async_search(
+async def get_search_results(
     query: str,
     search_type: str,
     k: int,
@@ -84,160 +324,447 @@ def run_async_search(
     filter_creator: str = None,
     filter_category: str = None,
     reranker: str = "zerank-1-small",
+    parallel_fanout: bool = True,
+    rerank_pool: int = None,
+    try_fallback: bool = False,
 ):
-    """Wrapper to run async search in Streamlit"""
-    # Create new event loop for this thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    # Run the async function
-    results, search_type = loop.run_until_complete(
-        get_search_results(
-            query,
-            search_type,
-            k,
-            collection_name,
-            filter_creator,
-            filter_category,
-            reranker,
-        )
-    )
-
-    loop.close()
-    return results, search_type
+    """Async search function that uses ZeroEntropy backend functionality.
 
+    Pipe-separated queries (e.g. "TPMP | famille royale") are searched separately,
+    concurrently when parallel_fanout is set, and their results are merged.
+    With try_fallback, the other search types run concurrently and are used when
+    the selected type finds nothing, see `search_with_fallback`.
+    """
+    searcher, utils = get_searcher_and_utils(collection_name)
 
-def display_document_results(results):
-    """Display document search results"""
-    for i, result in enumerate(results, 1):
-        with st.container():
-            col1, col2 = st.columns([3, 1])
+    # Prepare filter if specified
+    filter_dict = _filter_dict(_build_filter(filter_creator, filter_category))
+
+    queries = [q.strip() for q in query.split("|") if q.strip()]
+    if not queries:
+        return [], search_type
+
+    async def search_type_results(stype: str):
+        search = functools.partial(
+            search_single_query,
+            searcher,
+            utils,
+            search_type=stype,
+            k=k,
+            filter_dict=filter_dict,
+            reranker=reranker,
+            rerank_pool=rerank_pool,
+        )
+        if len(queries) == 1:
+            return await search(queries[0])
+
+        # Perform the searches concurrently, or one after the other
+        if parallel_fanout:
+            result_lists = await asyncio.wait_for(
+                asyncio.gather(*[search(q) for q in queries]),
+                timeout=FANOUT_TIMEOUT,
+            )
+        else:
+            result_lists = [await search(q) for q in queries]
 
-            with col1:
-                metadata = result.get("metadata", {})
-                title = metadata.get("title", "N/A")
+        return merge_results(result_lists, k)
 
-                # Make title clickable if file_url exists
-                if result.get("file_url"):
-                    st.markdown(f"### [{title}]({result['file_url']})")
-                else:
-                    st.markdown(f"### {title}")
+    if try_fallback:
+        return await search_with_fallback(search_type_results, search_type)
+    return await search_type_results(search_type), search_type
 
-                st.markdown(f"**Author:** {metadata.get('creator', 'N/A')}")
-                st.markdown(f"**Publication Date:** {metadata.get('pub_date', 'N/A')}")
-                st.markdown(f"**Categories:** {metadata.get('categories', 'N/A')}")
 
-                if metadata.get("source_url"):
-                    st.markdown(f"**Source:** {metadata.get('source_url', 'N/A')}")
+async def collect_advanced_stages(
+    query: str, k: int, rerank_pool: int, collection_name: str, stages: queue.SimpleQueue
+):
+    """Run an advanced search, putting each (stage, results) in the stages queue: retrieval first, then rerank"""
+    _, utils = get_searcher_and_utils(collection_name)
+    async for stage, results in utils.search_and_rerank_stream(
+        query=query, k=rerank_pool, rerank_top_n=k
+    ):
+        stages.put((stage, results))
+
+
+def run_progressive_advanced_search(query: str, k: int, rerank_pool: int, collection_name: str):
+    """Run an advanced search, showing the retrieved documents while the reranking is running"""
+    stage_placeholder = st.empty()
+    results_placeholder = st.empty()
+
+    stages = queue.SimpleQueue()
+    results = []
+
+    def _render_stages():
+        nonlocal results
+        while not stages.empty():
+            stage, results = stages.get()
+            if stage == "retrieval" and results:
+                stage_placeholder.info(f"⏳ Retrieved {len(results)} documents, reranking...")
+                with results_placeholder.container():
+                    display_results(results[:k], SCHEMAS["documents"])
 
-            with col2:
-                st.metric("Relevance Score", f"{result['score']:.3f}")
-                if result.get("rerank_score"):
-                    st.metric("Rerank Score", f"{result['rerank_score']:.3f}")
+    try:
+        run_cancellable(
+            collect_advanced_stages(query, k, rerank_pool, collection_name, stages),
+            on_poll=_render_stages,
+        )
+    finally:
+        stage_placeholder.empty()
+        results_placeholder.empty()
 
-            st.markdown("---")
+    return results
 
 
-def display_snippet_results(results):
-    """Display snippet search results"""
-    for i, result in enumerate(results, 1):
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                metadata = result.get("metadata", {})
-                st.markdown(f"### Snippet {i}")
-                st.markdown(f"**From:** {metadata.get('title', 'N/A')}")
-                st.markdown(f"**Author:** {metadata.get('creator', 'N/A')}")
-
-                # Show snippet content
-                if result.get("content"):
-                    with st.expander("Show Content", expanded=True):
-                        st.write(result["content"])
-
-            with col2:
-                st.metric("Relevance Score", f"{result['score']:.3f}")
-                st.write(
-                    f"**Char Range:** {result.get('start_index', 0)}-{result.get('end_index', 0)}"
-                )
-                st.write(f"**Page Span:** {result.get('page_span', [])}")
+def run_async_search(
+    query: str,
+    search_type: str,
+    k: int,
+    collection_name: str,
+    filter_creator: str = None,
+    filter_category: str = None,
+    reranker: str = "zerank-1-small",
+    parallel_fanout: bool = True,
+    rerank_pool: int = None,
+    try_fallback: bool = False,
+):
+    """Wrapper to run async search in Streamlit, serving repeated queries from the query cache"""
+    if search_type == "advanced" and rerank_pool is None:
+        rerank_pool = default_rerank_pool(k)
+
+    query_cache = get_query_cache()
+    cache_key = (
+        collection_name,
+        search_type,
+        query.strip().lower(),
+        k,
+        _build_filter(filter_creator, filter_category),
+        reranker,
+        parallel_fanout,
+        rerank_pool,
+        try_fallback,
+    )
+    cached = query_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Fall back to a semantically similar past query with identical parameters
+    semantic_cache = get_semantic_cache()
+    semantic_key = cache_key[:2] + cache_key[3:]
+    cached, query_embedding = semantic_cache.get(query.strip(), semantic_key)
+    if cached is not None:
+        query_cache.set(cache_key, cached)
+        return copy.deepcopy(cached)
+
+    # A single advanced query is rendered progressively, retrieval before rerank
+    if search_type == "advanced" and "|" not in query and not try_fallback:
+        results = run_progressive_advanced_search(query.strip(), k, rerank_pool, collection_name)
+        result_type = search_type
+    else:
+        # Run the async function on the persistent event loop
+        results, result_type = run_cancellable(
+            get_search_results(
+                query,
+                search_type,
+                k,
+                collection_name,
+                filter_creator,
+                filter_category,
+                reranker,
+                parallel_fanout,
+                rerank_pool,
+                try_fallback,
+            )
+        )
 
-            st.markdown("---")
+    # The result type differs from search_type after a fallback
+    query_cache.set(cache_key, (results, result_type))
+    semantic_cache.add(query.strip(), semantic_key, copy.deepcopy((results, result_type)), query_embedding)
+    return results, result_type
 
 
-def display_page_results(results):
-    """Display page search results"""
+def display_results_table(results, result_type):
+    """Display search results as a single summary table, with the detailed card of the selected row"""
+    rows = []
     for i, result in enumerate(results, 1):
-        with st.container():
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                metadata = result.get("metadata", {})
-                st.markdown(f"### Page {i}")
-                st.markdown(f"**From:** {metadata.get('title', 'N/A')}")
-                st.markdown(f"**Page Index:** {result.get('page_index', 0)}")
+        metadata = result.get("metadata") or {}
+        score = result.get("score")
+        rows.append(
+            {
+                "#": i,
+                "title": metadata.get("title", "N/A"),
+                "author": metadata.get("creator", "N/A"),
+                "score": score if score is not None else result.get("original_score"),
+                "rerank": result.get("rerank_score"),
+                "url": result.get("file_url"),
+            }
+        )
 
-                # Show page content
-                if result.get("content"):
-                    with st.expander("Show Content", expanded=False):
-                        st.write(
-                            result["content"][:500] + "..."
-                            if len(result["content"]) > 500
-                            else result["content"]
-                        )
+    event = st.dataframe(
+        pd.DataFrame(rows),
+        column_config={
+            "#": st.column_config.NumberColumn("#", width="small"),
+            "title": st.column_config.TextColumn("Title", width="large"),
+            "author": st.column_config.TextColumn("Author"),
+            "score": st.column_config.ProgressColumn(
+                "Relevance Score", format="%.3f", min_value=0.0, max_value=1.0
+            ),
+            "rerank": st.column_config.ProgressColumn(
+                "Rerank Score", format="%.3f", min_value=0.0, max_value=1.0
+            ),
+            "url": st.column_config.LinkColumn("File", display_text="Open"),
+        },
+        hide_index=True,
+        width="stretch",
+        on_select="rerun",
+        selection_mode="single-row",
+        key="results_table",
+    )
 
-            with col2:
-                st.metric("Relevance Score", f"{result['score']:.3f}")
+    # Only the selected result is rendered in full, with its content
+    selected = event.selection.rows
+    if selected and selected[0] < len(results):
+        index = selected[0]
+        display_results(results[index : index + 1], SCHEMAS[result_type], start=index + 1)
+    else:
+        st.caption("Select a row to show the result details.")
 
-            st.markdown("---")
 
+# Result card rendered as a single HTML element, metadata values are escaped by autoescape
+CARD_HTML = """<div style="display:flex;gap:1rem;">
+<div style="flex:3;">
+<h3>{% if url %}<a href="{{ url }}" target="_blank">{{ title }}</a>{% else %}{{ title }}{% endif %}</h3>
+{% for label, value in fields %}<p><b>{{ label }}:</b> {{ value }}</p>
+{% endfor %}</div>
+<div style="flex:1;">
+{% for label, value in scores %}<p style="margin:0;font-size:0.875rem;opacity:0.7;">{{ label }}</p>
+<p style="font-size:1.75rem;">{{ value }}</p>
+{% endfor %}</div>
+</div>"""
 
-def display_advanced_results(results):
-    """Display advanced search results with reranking"""
-    for i, result in enumerate(results, 1):
-        with st.container():
-            col1, col2 = st.columns([3, 1])
 
-            with col1:
-                metadata = result.get("metadata", {})
-                title = metadata.get("title", "N/A")
+# Cache the compiled card template, the script body runs again on every rerun
+@st.cache_resource
+def get_card_template():
+    """Compile and cache the Jinja template of the result cards"""
+    return jinja2.Environment(autoescape=True).from_string(CARD_HTML)
+
+
+def render_card(title, fields, scores, url=None):
+    """Render a result card with its title, (label, value) fields and (label, value) scores"""
+    # Only link to web URLs, other schemes (e.g. javascript:) could run in the page
+    if not (isinstance(url, str) and url.startswith(("http://", "https://"))):
+        url = None
+    st.markdown(
+        get_card_template().render(title=title, fields=fields, scores=scores, url=url),
+        unsafe_allow_html=True,
+    )
 
-                st.markdown(f"### {title}")
-                st.markdown(f"**Author:** {metadata.get('creator', 'N/A')}")
-                st.markdown(f"**Publication Date:** {metadata.get('pub_date', 'N/A')}")
-                st.markdown(f"**Categories:** {metadata.get('categories', 'N/A')}")
 
-            with col2:
-                st.metric("Original Score", f"{result.get('original_score', 0):.3f}")
-                st.metric("Rerank Score", f"{result.get('rerank_score', 0):.3f}")
+# Display schema of each result type:
+# - heading: card title template, formatted with the result rank i and the result fields
+# - link: result field holding the URL the title links to, if any
+# - fields: (label, template, optional_key) rows, templates are filled with the result fields merged
+#   over its metadata, missing keys show "N/A", rows are skipped when their optional_key is empty
+# - scores: (label, key, default) metrics, skipped when missing and the default is None
+# - content_mode: "expander" shows the full content, "preview" its preview with a button to load it all
+SCHEMAS = {
+    "documents": {
+        "heading": "{title}",
+        "link": "file_url",
+        "fields": [
+            ("Author", "{creator}", None),
+            ("Publication Date", "{pub_date}", None),
+            ("Categories", "{categories}", None),
+            ("Source", "{source_url}", "source_url"),
+        ],
+        "scores": [("Relevance Score", "score", None), ("Rerank Score", "rerank_score", None)],
+        "content_mode": None,
+    },
+    "snippets": {
+        "heading": "Snippet {i}",
+        "link": None,
+        "fields": [
+            ("From", "{title}", None),
+            ("Author", "{creator}", None),
+            ("Char Range", "{start_index}-{end_index}", None),
+            ("Page Span", "{page_span}", None),
+        ],
+        "scores": [("Relevance Score", "score", None)],
+        "content_mode": "expander",
+    },
+    "pages": {
+        "heading": "Page {i}",
+        "link": None,
+        "fields": [
+            ("From", "{title}", None),
+            ("Page Index", "{page_index}", None),
+        ],
+        "scores": [("Relevance Score", "score", None)],
+        "content_mode": "preview",
+    },
+    "advanced": {
+        "heading": "{title}",
+        "link": None,
+        "fields": [
+            ("Author", "{creator}", None),
+            ("Publication Date", "{pub_date}", None),
+            ("Categories", "{categories}", None),
+        ],
+        "scores": [("Original Score", "original_score", 0), ("Rerank Score", "rerank_score", 0)],
+        "content_mode": None,
+    },
+}
+
+
+def display_results(results, schema, start=1):
+    """Display search results as cards, following the display schema of their type"""
+    heading, link, content_mode = schema["heading"], schema["link"], schema["content_mode"]
+    for i, result in enumerate(results, start):
+        metadata = result.get("metadata") or {}
+        values = DefaultMissing(metadata, **result, i=i)
+
+        fields = [
+            (label, template.format_map(values))
+            for label, template, optional_key in schema["fields"]
+            if optional_key is None or metadata.get(optional_key)
+        ]
+
+        scores = []
+        for label, key, default in schema["scores"]:
+            value = result.get(key, default)
+            if value or default is not None:
+                scores.append((label, f"{value:.3f}"))
+
+        render_card(heading.format_map(values), fields, scores, url=result.get(link) if link else None)
+
+        content = result.get("content") if content_mode else None
+        if content and content_mode == "expander":
+            with st.expander("Show Content", expanded=True):
+                st.write(content)
+        elif content:
+            # Show the content preview, the full content is only sent on demand
+            with st.expander("Show Content", expanded=False):
+                if st.button("Load full content", key=f"full_content_{i}"):
+                    st.write(content)
+                else:
+                    st.write(result["content_preview"])
 
-            st.markdown("---")
+        st.markdown("---")
 
 
 async def get_collection_status(collection_name):
     """Get collection status"""
-    try:
-        searcher, _ = get_searcher_and_utils(collection_name)
-        status = await searcher.get_collection_status()
-        return status
-    except Exception as e:
-        st.error(f"Error getting status: {str(e)}")
-        return None
+    searcher, _ = get_searcher_and_utils(collection_name)
+    status = await searcher.get_collection_status()
+    return status
+
+
+# Cache the status for a few seconds, its counters change slowly
+@st.cache_data(ttl=10, show_spinner=False)
+def _fetch_status(collection_name):
+    """Fetch the collection status on the persistent event loop, as a plain dict"""
+    status = run_coroutine(get_collection_status(collection_name))
+    return {
+        "num_documents": status.num_documents,
+        "num_indexed_documents": status.num_indexed_documents,
+        "num_parsing_documents": status.num_parsing_documents,
+        "num_indexing_documents": status.num_indexing_documents,
+        "num_failed_documents": status.num_failed_documents,
+    }
 
 
 def run_async_status(collection_name):
     """Wrapper to run async status check in Streamlit"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        status = loop.run_until_complete(get_collection_status(collection_name))
-        loop.close()
-        return status
+        return _fetch_status(collection_name)
     except Exception as e:
         st.error(f"Error getting status: {str(e)}")
         return None
 
 
+# Sidebar markdown templates, one paragraph per line
+STATUS_TEMPLATE = "\n\n".join(
+    [
+        "**Total Documents:** {num_documents}",
+        "**Indexed:** {num_indexed_documents}",
+        "**Parsing:** {num_parsing_documents}",
+        "**Indexing:** {num_indexing_documents}",
+        "**Failed:** {num_failed_documents}",
+    ]
+)
+CACHE_STATS_TEMPLATE = "\n\n".join(
+    [
+        "**Entries:** {size}",
+        "**Hits:** {hits}",
+        "**Misses:** {misses}",
+        "**Hit Rate:** {hit_rate:.1%}",
+    ]
+)
+
+
+# Only this panel reruns on query edits, searches and result interactions, not the sidebar
+@st.fragment
+def search_panel(
+    collection_name: str,
+    search_type: str,
+    k: int,
+    reranker: str,
+    filter_creator: str,
+    filter_category: str,
+    detailed_view: bool,
+    try_fallback: bool,
+    parallel_fanout: bool,
+    rerank_pool: int = None,
+):
+    """Render the search input, run the search and display the last results"""
+    query = st.text_input(
+        "🔍 Enter your search query:",
+        value="",
+        placeholder="e.g., TPMP, famille royale, célébrités...",
+    )
+
+    search_clicked = st.button("Search for a keyword", type="primary")
+
+    if st.session_state.pop("cancel_search", False):
+        st.info("🛑 Search cancelled.")
+
+    if search_clicked:
+        if query.strip():
+            with st.spinner(f"Searching with {search_type} mode..."):
+                results, result_type = run_async_search(
+                    query=query,
+                    search_type=search_type,
+                    k=k,
+                    collection_name=collection_name,
+                    filter_creator=filter_creator if filter_creator else None,
+                    filter_category=filter_category if filter_category else None,
+                    reranker=reranker,
+                    parallel_fanout=parallel_fanout,
+                    rerank_pool=rerank_pool,
+                    try_fallback=try_fallback,
+                )
+            st.session_state["last_search"] = (query, search_type, results, result_type)
+        else:
+            st.session_state.pop("last_search", None)
+            st.error("⚠️ Please enter a valid query.")
+
+    # Display the last search, kept across the reruns triggered by result widgets
+    if "last_search" in st.session_state:
+        last_query, last_type, results, result_type = st.session_state["last_search"]
+        if results:
+            st.success(f"✅ Found {len(results)} results for '{last_query}'")
+            if result_type != last_type:
+                st.info(f"No {last_type} results, showing {result_type} results instead.")
+
+            # Display results based on search type
+            if not detailed_view:
+                display_results_table(results, result_type)
+            elif result_type in SCHEMAS:
+                display_results(results, SCHEMAS[result_type])
+
+        else:
+            st.warning("❌ No results found for your query.")
+
+
 def main():
     st.set_page_config(
         page_title="ZeroEntropy Gossip Search", layout="wide", page_icon="📰"
@@ -254,6 +781,17 @@ def main():
 
         collection_name = st.text_input("Collection Name", value="my_articles")
 
+        # Warm the cached event loop, semantic cache model, searcher and utils while the user is typing the
+        # query. A failure (e.g. a missing ZEROENTROPY_API_KEY) is shown without blocking the rest of the page
+        if st.session_state.get("warmed") != collection_name:
+            get_event_loop()
+            get_semantic_cache()
+            try:
+                get_searcher_and_utils(collection_name)
+                st.session_state["warmed"] = collection_name
+            except Exception as e:
+                st.error(f"Error initializing ZeroEntropy client: {str(e)}")
+
         search_type = st.selectbox(
             "Search Type",
             options=["documents", "snippets", "pages", "advanced"],
@@ -263,6 +801,17 @@ def main():
 
         k = st.slider("Number of results", min_value=1, max_value=20, value=5)
 
+        # Candidates reranked by the advanced search, more improves recall but slows the reranking
+        rerank_pool = None
+        if search_type == "advanced":
+            rerank_pool = st.slider(
+                "Rerank candidate pool",
+                min_value=k,
+                max_value=50,
+                value=default_rerank_pool(k),
+                help="Documents retrieved before reranking: a larger pool improves recall, a smaller one is faster",
+            )
+
         # Advanced options
         with st.expander("🔍 Advanced Options"):
             reranker = st.selectbox(
@@ -276,55 +825,60 @@ def main():
                 "Filter by Category", placeholder="e.g., TPMP"
             )
 
+            detailed_view = st.toggle(
+                "Detailed view",
+                value=False,
+                help="Show one card per result instead of a summary table",
+            )
+
+            try_fallback = st.checkbox(
+                "Try fallback",
+                value=False,
+                help="Also run the other search types concurrently, used when the selected one finds nothing",
+            )
+
+            parallel_fanout = st.checkbox(
+                "Parallel fanout",
+                value=True,
+                help="Search pipe-separated queries (e.g. TPMP | famille royale) concurrently",
+            )
+
         # Collection status
         if st.button("📊 Check Collection Status"):
             with st.spinner("Getting status..."):
                 status = run_async_status(collection_name)
                 if status:
                     st.success("✅ Collection Status")
-                    st.write(f"**Total Documents:** {status.num_documents}")
-                    st.write(f"**Indexed:** {status.num_indexed_documents}")
-                    st.write(f"**Parsing:** {status.num_parsing_documents}")
-                    st.write(f"**Indexing:** {status.num_indexing_documents}")
-                    st.write(f"**Failed:** {status.num_failed_documents}")
+                    st.markdown(STATUS_TEMPLATE.format_map(DefaultMissing(status)))
 
-    # Main search interface
-    query = st.text_input(
-        "🔍 Enter your search query:",
-        value="",
-        placeholder="e.g., TPMP, famille royale, célébrités...",
-    )
+        # Query cache statistics
+        with st.expander("🐞 Cache Stats"):
+            query_cache = get_query_cache()
+            st.markdown(CACHE_STATS_TEMPLATE.format_map(query_cache.stats()))
+            if st.button("Clear Cache"):
+                query_cache.clear()
+                get_semantic_cache().clear()
 
-    if st.button("Search for a keyword", type="primary"):
-        if query.strip():
-            with st.spinner(f"Searching with {search_type} mode..."):
-                results, result_type = run_async_search(
-                    query=query,
-                    search_type=search_type,
-                    k=k,
-                    collection_name=collection_name,
-                    filter_creator=filter_creator if filter_creator else None,
-                    filter_category=filter_category if filter_category else None,
-                    reranker=reranker,
-                )
+    # Widget callbacks have run by now, so a search interrupted by this rerun is no longer in flight
+    st.session_state["search_running"] = False
 
-                if results:
-                    st.success(f"✅ Found {len(results)} results for '{query}'")
-
-                    # Display results based on search type
-                    if result_type == "documents":
-                        display_document_results(results)
-                    elif result_type == "snippets":
-                        display_snippet_results(results)
-                    elif result_type == "pages":
-                        display_page_results(results)
-                    elif result_type == "advanced":
-                        display_advanced_results(results)
+    # The Cancel button stays outside the fragment: a click inside a fragment only triggers a fragment
+    # rerun, which does not preempt the running search, while a full rerun interrupts it
+    st.button("🛑 Cancel running search", on_click=request_cancel, help="Stop the running search")
 
-                else:
-                    st.warning("❌ No results found for your query.")
-        else:
-            st.error("⚠️ Please enter a valid query.")
+    # Main search interface
+    search_panel(
+        collection_name=collection_name,
+        search_type=search_type,
+        k=k,
+        reranker=reranker,
+        filter_creator=filter_creator,
+        filter_category=filter_category,
+        detailed_view=detailed_view,
+        try_fallback=try_fallback,
+        parallel_fanout=parallel_fanout,
+        rerank_pool=rerank_pool,
+    )
 
     # Help section
     with st.expander("ℹ️ How to use this app"):
@@ -344,6 +898,7 @@ def main():
         - Use specific keywords for better results
         - Try different search types for different use cases
         - Use filters to narrow down results
+        - Separate several queries with `|` to search them all at once
         """
         )
 